@@ -0,0 +1,1968 @@
+#!/usr/bin/env python3
+"""
+Modern Recipe Management System (RMS)
+=====================================
+A consolidated, feature-rich recipe management system with cost calculation,
+unit conversion, and professional recipe scaling capabilities.
+
+Author: Claude Code & User
+Version: 2.0
+"""
+
+import sqlite3
+import json
+import os
+import sys
+import itertools
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple, Optional, Any
+from dataclasses import dataclass, asdict
+import argparse
+from tabulate import tabulate
+
+
+@dataclass(slots=True)
+class Ingredient:
+    """Data class for ingredient information."""
+    id: int
+    name: str
+    category: str
+    # Purchase level
+    purchase_unit: str  # How you buy it (case, bag, etc.)
+    purchase_price: float  # Price per purchase unit
+    # Inventory level
+    inventory_unit: str  # What you track in stock (#10 can, lb, ea, etc.)
+    units_per_purchase: float  # How many inventory units per purchase unit
+    cost_per_inventory_unit: float  # Cost per inventory unit
+    on_hand: float  # Inventory on hand (in inventory units)
+    # Recipe level
+    recipe_unit: str  # What recipes use (C, oz, ea, etc.)
+    recipe_units_per_inventory: float  # How many recipe units per inventory unit
+    cost_per_recipe_unit: float  # Cost per recipe unit (with yield applied)
+    yield_percent: float  # Yield percentage
+    # Metadata (all have defaults)
+    par_level: float = 0.0  # Par level (in inventory units)
+    supplier: str = ""
+    notes: str = ""
+    allergens: str = ""
+    is_used: int = 0  # Set by list views: 1 if any recipe or plate uses it
+
+
+@dataclass(slots=True)
+class Recipe:
+    """Data class for recipe information."""
+    name: str
+    servings: int
+    q_factor: float = 0.04
+    description: str = ""
+    prep_time: int = 0  # minutes
+    cook_time: int = 0  # minutes
+    instructions: str = ""
+    whole_unit: bool = False  # True for recipes that come in discrete units (pies, cakes, etc.)
+
+
+@dataclass(slots=True)
+class RecipeIngredient:
+    """Data class for recipe-ingredient associations."""
+    recipe_name: str
+    ingredient_name: str
+    quantity: float
+    unit: str
+    on_hand: float = 0  # Set by the recipe view: stock of the ingredient
+
+
+@dataclass(slots=True)
+class Plate:
+    """Data class for plate/menu item information."""
+    name: str
+    category: str
+    description: str = ""
+
+
+@dataclass(slots=True)
+class PlateIngredient:
+    """Data class for plate-ingredient associations."""
+    plate_name: str
+    ingredient_name: str
+    quantity: float
+    unit: str
+
+
+def _to_cents(amount: float) -> int:
+    """Round a dollar amount to whole cents, matching round(amount, 2)."""
+    return round(round(amount, 2) * 100)
+
+
+def _cost_to_cents(amount: float) -> int:
+    """Round an ingredient cost to whole cents, charging at least a cent for any positive cost."""
+    cents = _to_cents(amount)
+    if cents == 0 and amount > 0:
+        return 1
+    return cents
+
+
+class UnitConverter:
+    """Handles all unit conversions for the RMS."""
+
+    # Unit name normalization (maps to JSON-style notation)
+    _UNIT_ALIASES = {
+        # Tablespoon/Teaspoon aliases
+        "T": "T", "tbsp": "T", "tablespoon": "T", "tablespoons": "T",
+        "tsp": "t", "teaspoon": "t", "teaspoons": "t",
+
+        # Volume aliases (to JSON notation with periods)
+        "c": "C", "cup": "C", "cups": "C",
+        "ounce": "oz.", "ounces": "oz.", "oz": "oz.",
+        "gal": "Gal.", "gallon": "Gal.", "gallons": "Gal.",
+        "qt": "qt.", "quart": "qt.", "quarts": "qt.",
+        "pt": "pt.", "pint": "pt.", "pints": "pt.",
+
+        # Weight aliases
+        "pound": "lb", "pounds": "lb",
+
+        # Count aliases
+        "each": "ea", "eaches": "ea",
+        "doz": "doz.", "dozen": "doz.",
+    }
+
+    # Units tried, in order, to bridge pairs without a direct factor
+    _INTERMEDIATES = ("t", "T", "C", "oz.", "lb", "Gal.", "ea")
+
+    def __init__(self):
+        self.conversion_factors = {
+            # Volume conversions (using JSON notation: Gal., qt., pt., oz.)
+            ("Gal.", "qt."): 4, ("Gal.", "pt."): 8, ("Gal.", "C"): 16,
+            ("Gal.", "oz."): 128, ("Gal.", "T"): 256, ("Gal.", "t"): 768,
+            ("Gal.", "L"): 3.78541, ("Gal.", "mL"): 3785.41,
+            ("Gal.", "lb"): 8,  # Weight-to-volume for water/liquids
+
+            ("qt.", "Gal."): 0.25, ("qt.", "pt."): 2, ("qt.", "C"): 4,
+            ("qt.", "oz."): 32, ("qt.", "T"): 64, ("qt.", "t"): 192,
+            ("qt.", "L"): 0.946353, ("qt.", "mL"): 946.353,
+            ("qt.", "lb"): 2,  # Weight-to-volume for water/liquids
+
+            ("pt.", "Gal."): 0.125, ("pt.", "qt."): 0.5, ("pt.", "C"): 2,
+            ("pt.", "oz."): 16, ("pt.", "T"): 32, ("pt.", "t"): 96,
+            ("pt.", "L"): 0.473176, ("pt.", "mL"): 473.176,
+            ("pt.", "lb"): 1,  # Weight-to-volume for water/liquids
+
+            ("C", "Gal."): 0.0625, ("C", "qt."): 0.25, ("C", "pt."): 0.5,
+            ("C", "oz."): 8, ("C", "T"): 16, ("C", "t"): 48,
+            ("C", "L"): 0.236588, ("C", "mL"): 236.588,
+            ("C", "lb"): 0.5,  # Weight-to-volume for water/liquids
+
+            ("oz.", "Gal."): 0.0078125, ("oz.", "qt."): 0.03125, ("oz.", "pt."): 0.0625,
+            ("oz.", "C"): 0.125, ("oz.", "T"): 2, ("oz.", "t"): 6,
+            ("oz.", "L"): 0.0295735, ("oz.", "mL"): 29.5735,
+            ("oz.", "lb"): 0.0625,
+
+            ("T", "Gal."): 0.00390625, ("T", "qt."): 0.015625, ("T", "pt."): 0.03125,
+            ("T", "C"): 0.0625, ("T", "oz."): 0.5, ("T", "t"): 3,
+            ("T", "L"): 0.0147868, ("T", "mL"): 14.7868,
+            ("T", "lb"): 0.03125,  # Approximate for dense ingredients
+            ("T", "bunch"): 0.0625,  # Tablespoon to bunch for herbs
+
+            ("t", "Gal."): 0.00130208, ("t", "qt."): 0.00520833, ("t", "pt."): 0.0104167,
+            ("t", "C"): 0.0208333, ("t", "oz."): 0.166667, ("t", "T"): 0.333333,
+            ("t", "L"): 0.00492892, ("t", "mL"): 4.92892,
+            ("t", "lb"): 0.0104167,  # Approximate for dense ingredients like salt
+
+            # Weight conversions
+            ("lb", "oz."): 16, ("lb", "g"): 453.592, ("lb", "Kg"): 0.453592,
+            ("lb", "Gal."): 0.125, ("lb", "qt."): 0.5, ("lb", "pt."): 1, ("lb", "C"): 2,  # Weight-to-volume
+            ("lb", "T"): 32, ("lb", "t"): 96,  # Weight-to-volume for dense ingredients
+            ("lb", "L"): 0.453592, ("lb", "mL"): 453.592,
+
+            ("oz.", "lb"): 0.0625, ("oz.", "g"): 28.3495,
+            ("g", "lb"): 0.00220462, ("g", "oz."): 0.035274,
+            ("Kg", "lb"): 2.20462,
+
+            ("L", "Gal."): 0.264172, ("L", "qt."): 1.05669, ("L", "pt."): 2.11338,
+            ("L", "C"): 4.22675, ("L", "oz."): 33.814, ("L", "T"): 67.628, ("L", "t"): 202.884,
+            ("L", "lb"): 2.20462, ("L", "mL"): 1000,
+
+            ("mL", "Gal."): 0.000264172, ("mL", "qt."): 0.00105669, ("mL", "pt."): 0.00211338,
+            ("mL", "C"): 0.00422675, ("mL", "oz."): 0.033814, ("mL", "T"): 0.067628, ("mL", "t"): 0.202884,
+            ("mL", "lb"): 0.00220462, ("mL", "L"): 0.001,
+
+            # Count conversions
+            ("doz.", "ea"): 12, ("ea", "doz."): 0.0833333,
+            ("case", "ea"): 24, ("ea", "case"): 0.0416667,
+
+            # Special conversions
+            ("clove", "lb"): 0.02, ("lb", "clove"): 50,
+            ("tbsp", "clove"): 3,  # 1 clove ≈ 3 tbsp when minced/chopped
+            ("bunch", "t"): 70, ("t", "bunch"): 0.0142857,
+            ("bunch", "T"): 16,  # 1 bunch ≈ 16 tbsp for herbs
+            ("loaf", "slice"): 15, ("slice", "loaf"): 0.0666667,
+
+            # Can conversions (standard #10 can)
+            ("can", "oz."): 106, ("oz.", "can"): 0.00943396,  # #10 can = 106 oz
+            ("can", "C"): 13.25, ("C", "can"): 0.0754717,  # #10 can = 13.25 cups (106 oz / 8 oz per cup)
+
+            # Produce conversions
+            ("head", "ea"): 1.0, ("ea", "head"): 1.0,  # Head = each for lettuce/cabbage
+
+            # Produce weight conversions (approximate averages)
+            ("ea-cucumber", "oz"): 3.5, ("oz", "ea-cucumber"): 0.2857,  # Persian cucumber ~3.5 oz
+            ("ea-plum-tomato", "oz"): 2.5, ("oz", "ea-plum-tomato"): 0.4,  # Plum tomato ~2.5 oz
+            ("ea-tomato", "oz"): 5.0, ("oz", "ea-tomato"): 0.2,  # Regular tomato ~5 oz
+            ("ea-olive", "oz"): 0.15, ("oz", "ea-olive"): 6.67,  # Cocktail olive ~0.15 oz (about 100 per lb)
+            ("ea-lemon", "oz"): 3.5, ("oz", "ea-lemon"): 0.2857,  # Average lemon ~3.5 oz
+            ("ea-shrimp-16-20", "lb"): 0.0556, ("lb", "ea-shrimp-16-20"): 18,  # 16/20 count = ~18 shrimp per lb
+
+            # Count unit equivalencies
+            ("pieces", "each"): 1.0, ("each", "pieces"): 1.0,
+            ("piece", "each"): 1.0, ("each", "piece"): 1.0,
+            ("pieces", "ea"): 1.0, ("ea", "pieces"): 1.0,
+            ("piece", "ea"): 1.0, ("ea", "piece"): 1.0,
+
+            # Culinary unit conversions (approximate small quantities)
+            ("pinch", "t"): 0.0625, ("t", "pinch"): 16,  # 1/16 tsp
+            ("sprinkle", "t"): 0.125, ("t", "sprinkle"): 8,  # 1/8 tsp
+            ("dash", "t"): 0.125, ("t", "dash"): 8,  # 1/8 tsp
+            ("drizzle", "T"): 0.5, ("T", "drizzle"): 2,  # 1/2 tbsp = 1.5 tsp
+            ("dollop", "T"): 1.0, ("T", "dollop"): 1,  # 1 tbsp
+            ("garnish", "t"): 0.25, ("t", "garnish"): 4,  # 1/4 tsp
+            ("sprig", "t"): 0.125, ("t", "sprig"): 8,  # 1/8 tsp
+            ("dust", "t"): 0.0625, ("t", "dust"): 16,  # 1/16 tsp
+            ("smear", "t"): 0.5, ("t", "smear"): 2,  # 1/2 tsp
+            ("quenelle", "T"): 1.0, ("T", "quenelle"): 1,  # 1 tbsp
+
+            # Fractional produce units
+            ("wedge", "ea"): 0.25, ("ea", "wedge"): 4,  # 1 wedge = 1/4 of a whole
+            ("half", "ea"): 0.5, ("ea", "half"): 2,  # 1 half = 1/2 of a whole
+            ("quarter", "ea"): 0.25, ("ea", "quarter"): 4,  # 1 quarter = 1/4 of a whole
+            ("slice", "ea"): 0.0625, ("ea", "slice"): 16,  # Approximate: 16 slices per whole
+        }
+        self._closure = self._build_closure()
+
+    def normalize(self, unit: str) -> str:
+        """Map a unit spelling to its canonical name (e.g. 'tsp' -> 't')."""
+        return self._UNIT_ALIASES.get(unit, unit)
+
+    def convert(self, quantity: float, from_unit: str, to_unit: str) -> float:
+        """Convert quantity from one unit to another."""
+        if from_unit == to_unit:
+            return quantity
+
+        try:
+            return quantity * self._closure[(from_unit, to_unit)]
+        except KeyError:
+            from_unit = self.normalize(from_unit)
+            to_unit = self.normalize(to_unit)
+            if from_unit == to_unit:
+                return quantity
+            raise ValueError(f"No conversion available from {from_unit} to {to_unit}") from None
+
+    def factors(self) -> Iterator[Tuple[str, str, float]]:
+        """Yield every (from_unit, to_unit, factor) that convert() can look up directly."""
+        for (from_unit, to_unit), factor in self._closure.items():
+            yield from_unit, to_unit, factor
+
+    def _build_closure(self) -> Dict[Tuple[str, str], float]:
+        """Materialize every convertible (from_unit, to_unit) pair into a flat lookup.
+
+        Keys cover every spelling the converter knows (aliases included), so
+        convert() never has to normalize or search for an intermediate unit.
+        """
+        # Conversion graph: graph[a][b] is the factor from a to b. Direct
+        # factors win over the reciprocal of the opposite direction.
+        graph: Dict[str, Dict[str, float]] = {}
+        for (from_unit, to_unit), factor in self.conversion_factors.items():
+            graph.setdefault(from_unit, {})[to_unit] = factor
+        for (from_unit, to_unit), factor in self.conversion_factors.items():
+            graph.setdefault(to_unit, {}).setdefault(from_unit, 1 / factor)
+
+        spellings = set(graph)
+        spellings.update(self._UNIT_ALIASES)
+        spellings.update(self._UNIT_ALIASES.values())
+        units = {self._UNIT_ALIASES.get(spelling, spelling) for spelling in spellings}
+
+        # Breadth-first from each unit: direct neighbours first, then one hop
+        # through the intermediates in priority order. The search stops at two
+        # edges so the same pairs convert, with the same factors, as before.
+        resolved: Dict[Tuple[str, str], float] = {}
+        for from_unit in units:
+            neighbours = graph.get(from_unit, {})
+            for to_unit, factor in neighbours.items():
+                resolved[(from_unit, to_unit)] = factor
+            for intermediate in self._INTERMEDIATES:
+                if intermediate not in neighbours:
+                    continue
+                first = neighbours[intermediate]
+                for to_unit, second in graph[intermediate].items():
+                    resolved.setdefault((from_unit, to_unit), first * second)
+            resolved[(from_unit, from_unit)] = 1
+
+        closure = {}
+        for from_spelling in spellings:
+            from_unit = self._UNIT_ALIASES.get(from_spelling, from_spelling)
+            for to_spelling in spellings:
+                factor = resolved.get((from_unit, self._UNIT_ALIASES.get(to_spelling, to_spelling)))
+                if factor is not None:
+                    closure[(from_spelling, to_spelling)] = factor
+        return closure
+
+
+class DatabaseManager:
+    """Manages all database operations for the RMS."""
+
+    # Secondary indexes for the hot read paths
+    _INDEXES = (
+        # Lets the ingredients JOIN in recipe costing stay index-only
+        "CREATE INDEX IF NOT EXISTS idx_ing_name_cover ON ingredients(name, cost_per_recipe_unit, recipe_unit)",
+        # Reverse "where is this ingredient used" lookups
+        "CREATE INDEX IF NOT EXISTS idx_ri_ingredient ON recipe_ingredients(ingredient_name, recipe_name)",
+        "CREATE INDEX IF NOT EXISTS idx_pi_ingredient ON plate_ingredients(ingredient_name)",
+        # Case-insensitive category filter on the ingredients page
+        "CREATE INDEX IF NOT EXISTS idx_ing_category_nocase ON ingredients(category COLLATE NOCASE, name)",
+        # Category-then-name listing order, read straight from the index
+        "CREATE INDEX IF NOT EXISTS idx_ing_category ON ingredients(category, name)",
+        # Prep list: recipes grouped by station, read in order without a sort
+        "CREATE INDEX IF NOT EXISTS idx_recipes_station ON recipes(station, name)",
+        # Category rename/delete and per-category display_order lookups on plates
+        "CREATE INDEX IF NOT EXISTS idx_plates_category ON plates(category, display_order)",
+        # MAX(display_order), neighbour lookups and the listing order for plate categories
+        "CREATE INDEX IF NOT EXISTS idx_plate_categories_order ON plate_categories(display_order)",
+    )
+
+    def __init__(self, db_path: str = "rms_unified.db"):
+        self.db_path = db_path
+        self.converter = UnitConverter()
+        self._lock = threading.RLock()
+        # Shared by every request thread in the web app; access is serialized by _lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+        for pragma in self._PRAGMAS:
+            self._conn.execute(pragma)
+        # Memoized query results, dropped whenever the database changes
+        self._caches: Dict[str, Dict[Any, Any]] = {}
+        self._cache_token = None
+        self._init_database()
+        self._load_unit_conversions()
+
+    # Applied to every connection: WAL so readers never block the writer,
+    # NORMAL sync (safe under WAL), a 64 MB page cache and memory-mapped reads.
+    _PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    @contextmanager
+    def _connect(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Yield the shared connection inside a transaction.
+
+        The connection is opened once per DatabaseManager and kept for its
+        lifetime, so PRAGMAs and compiled statements are reused across calls.
+        The lock is reentrant because some methods call each other while a
+        block is open; the connection's own context manager commits on
+        success and rolls back on error, as the old per-call connections did.
+
+        With immediate=True the block starts with BEGIN IMMEDIATE, taking the
+        write lock up front so a multi-statement write cannot fail half-way
+        on a lock upgrade. It has no effect inside an already open transaction.
+        """
+        with self._lock, self._conn:
+            if immediate and not self._conn.in_transaction:
+                self._conn.execute("BEGIN IMMEDIATE")
+            yield self._conn
+
+    def connect(self, immediate: bool = False):
+        """Public form of _connect for callers that run their own SQL (the web app).
+
+        Use it as ``with db_manager.connect() as conn:``; the block commits on
+        success and rolls back on error, like a fresh sqlite3 connection would.
+        Do not close the yielded connection.
+        """
+        return self._connect(immediate)
+
+    def data_version(self) -> Tuple[int, int]:
+        """Return a token that changes whenever the database content changes.
+
+        PRAGMA data_version moves when any other connection commits (such as
+        another process); total_changes moves on writes made through this
+        connection. The token is only comparable within one DatabaseManager.
+        """
+        with self._lock:
+            return (self._conn.execute("PRAGMA data_version").fetchone()[0],
+                    self._conn.total_changes)
+
+    def _cache(self, name: str) -> Dict[Any, Any]:
+        """Return the named memo dict, emptied if the database changed since it was filled."""
+        with self._lock:
+            token = self.data_version()
+            if token != self._cache_token:
+                self._caches.clear()
+                self._cache_token = token
+            return self._caches.setdefault(name, {})
+
+    def set_trace_callback(self, callback: Optional[Callable[[str], None]]):
+        """Pass the text of every statement the shared connection runs to callback (None stops tracing)."""
+        with self._lock:
+            self._conn.set_trace_callback(callback)
+
+    def close(self):
+        """Refresh query planner statistics and close the shared connection."""
+        with self._lock:
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
+
+    def _init_database(self):
+        """Initialize the database with proper schema."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+
+            # Create ingredients table with bulk purchasing focus
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ingredients (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL,
+                    category TEXT NOT NULL,
+                    bulk_unit TEXT NOT NULL,
+                    bulk_quantity REAL NOT NULL,
+                    bulk_price REAL NOT NULL,
+                    recipe_unit TEXT NOT NULL,
+                    unit_price REAL NOT NULL,
+                    on_hand REAL NOT NULL,
+                    supplier TEXT DEFAULT '',
+                    notes TEXT DEFAULT '',
+                    yield_percent REAL DEFAULT 95.0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Create recipes table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS recipes (
+                    name TEXT PRIMARY KEY,
+                    servings INTEGER NOT NULL,
+                    q_factor REAL DEFAULT 0.04,
+                    description TEXT DEFAULT '',
+                    prep_time INTEGER DEFAULT 0,
+                    cook_time INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Create recipe_ingredients junction table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS recipe_ingredients (
+                    recipe_name TEXT NOT NULL,
+                    ingredient_name TEXT NOT NULL,
+                    quantity REAL NOT NULL,
+                    unit TEXT NOT NULL,
+                    PRIMARY KEY (recipe_name, ingredient_name),
+                    FOREIGN KEY (recipe_name) REFERENCES recipes(name) ON DELETE CASCADE,
+                    FOREIGN KEY (ingredient_name) REFERENCES ingredients(name) ON DELETE CASCADE
+                ) WITHOUT ROWID
+            """)
+
+            # Create recipe_steps table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS recipe_steps (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recipe_name TEXT NOT NULL,
+                    step_number INTEGER NOT NULL,
+                    description TEXT NOT NULL,
+                    FOREIGN KEY (recipe_name) REFERENCES recipes(name) ON DELETE CASCADE,
+                    UNIQUE(recipe_name, step_number)
+                )
+            """)
+
+            # Migrations run on the same connection before the single commit below
+            self._migrate_ingredient_schema(conn)
+            self._migrate_recipe_ingredients_without_rowid(conn)
+            self._migrate_ingredient_allergens(conn)
+            self._drop_recipe_allergen_cache(conn)
+            self._create_indexes(conn)
+
+    def _load_unit_conversions(self):
+        """Copy the converter's factors into a TEMP table so costing queries can join on them.
+
+        TEMP tables live only on this connection, so the table is rebuilt from
+        the UnitConverter every time a DatabaseManager is created.
+        """
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS unit_conversions (
+                    from_unit TEXT NOT NULL,
+                    to_unit TEXT NOT NULL,
+                    factor REAL NOT NULL,
+                    PRIMARY KEY (from_unit, to_unit)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("DELETE FROM temp.unit_conversions")
+            conn.executemany("INSERT INTO temp.unit_conversions VALUES (?, ?, ?)",
+                             self.converter.factors())
+
+    def _create_indexes(self, conn: sqlite3.Connection):
+        """Create secondary indexes that the current schema supports."""
+        cursor = conn.cursor()
+        for statement in self._INDEXES:
+            try:
+                cursor.execute(statement)
+            except sqlite3.OperationalError:
+                # Table or column not present in this database's schema yet
+                continue
+
+        # Give the planner statistics once; close() keeps them fresh with PRAGMA optimize
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            cursor.execute("ANALYZE")
+
+    def _migrate_ingredient_schema(self, conn: sqlite3.Connection):
+        """Migrate existing ingredient data to new bulk purchasing schema."""
+        cursor = conn.cursor()
+
+        # Check if migration is needed
+        cursor.execute("PRAGMA table_info(ingredients)")
+        columns = [col[1] for col in cursor.fetchall()]
+
+        # Check if already using new schema (purchase_unit exists)
+        if 'purchase_unit' in columns:
+            # Already migrated to new schema, skip migration
+            return
+
+        if 'bulk_unit' not in columns:
+            print("Migrating ingredient database to bulk purchasing schema...")
+
+            # Create new table with bulk purchasing structure
+            cursor.execute("""
+                CREATE TABLE ingredients_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL,
+                    category TEXT NOT NULL,
+                    bulk_unit TEXT NOT NULL,
+                    bulk_quantity REAL NOT NULL,
+                    bulk_price REAL NOT NULL,
+                    recipe_unit TEXT NOT NULL,
+                    unit_price REAL NOT NULL,
+                    on_hand REAL NOT NULL,
+                    supplier TEXT DEFAULT '',
+                    notes TEXT DEFAULT '',
+                    yield_percent REAL DEFAULT 95.0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Migrate existing data with bulk purchasing defaults
+            cursor.execute("""
+                INSERT INTO ingredients_new
+                (name, category, bulk_unit, bulk_quantity, bulk_price, recipe_unit,
+                 unit_price, on_hand, supplier, notes, yield_percent)
+                SELECT
+                    name,
+                    CASE
+                        WHEN category IN ('Dairy and Eggs', 'Dairy') THEN 'Dairy and Eggs'
+                        WHEN category IN ('Spices and Seasonings', 'Spices And Seasonings') THEN 'Spices and Seasonings'
+                        WHEN category IN ('Oils and Vinegars', 'Oils Vinegars Water') THEN 'Oils and Vinegars'
+                        WHEN category = 'Nuts And Seeds' THEN 'Nuts and Seeds'
+                        ELSE category
+                    END as category,
+                    CASE
+                        WHEN purchase_unit LIKE '%case%' THEN 'case'
+                        WHEN purchase_unit LIKE '%sack%' THEN 'sack'
+                        WHEN purchase_unit LIKE '%box%' THEN 'box'
+                        WHEN purchase_unit LIKE '%bag%' THEN 'bag'
+                        WHEN purchase_unit LIKE '%lb%' THEN '50 lb case'
+                        WHEN purchase_unit LIKE '%gal%' THEN '4 gal case'
+                        ELSE 'case'
+                    END as bulk_unit,
+                    CASE
+                        WHEN purchase_unit LIKE '%case%' THEN 24.0
+                        WHEN purchase_unit LIKE '%sack%' THEN 50.0
+                        WHEN purchase_unit LIKE '%box%' THEN 12.0
+                        WHEN purchase_unit LIKE '%bag%' THEN 25.0
+                        WHEN purchase_unit LIKE '%lb%' THEN 50.0
+                        WHEN purchase_unit LIKE '%gal%' THEN 4.0
+                        ELSE 24.0
+                    END as bulk_quantity,
+                    unit_price * CASE
+                        WHEN purchase_unit LIKE '%case%' THEN 24.0
+                        WHEN purchase_unit LIKE '%sack%' THEN 50.0
+                        WHEN purchase_unit LIKE '%box%' THEN 12.0
+                        WHEN purchase_unit LIKE '%bag%' THEN 25.0
+                        WHEN purchase_unit LIKE '%lb%' THEN 50.0
+                        WHEN purchase_unit LIKE '%gal%' THEN 4.0
+                        ELSE 24.0
+                    END as bulk_price,
+                    base_unit as recipe_unit,
+                    unit_price,
+                    on_hand,
+                    '' as supplier,
+                    '' as notes,
+                    yield_percent
+                FROM ingredients
+            """)
+
+            # Drop old table and rename new one
+            cursor.execute("DROP TABLE ingredients")
+            cursor.execute("ALTER TABLE ingredients_new RENAME TO ingredients")
+
+            conn.commit()
+            print("Migration completed successfully!")
+
+    def _migrate_recipe_ingredients_without_rowid(self, conn: sqlite3.Connection):
+        """Rebuild recipe_ingredients clustered on (recipe_name, ingredient_name).
+
+        This drops the old surrogate id column, which nothing in the app
+        reads; rows are identified by (recipe_name, ingredient_name), which
+        was already UNIQUE. The ingredient foreign key is pointed at
+        ingredients(name); older databases still named ingredients_old there,
+        a table left behind by the bulk purchasing migration.
+
+        Runs in a savepoint, so it joins a transaction the caller already
+        has open instead of failing to BEGIN a second one.
+        """
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'recipe_ingredients'")
+        table_sql = cursor.fetchone()[0]
+        if 'WITHOUT ROWID' in table_sql.upper():
+            return
+
+        print("Migrating recipe_ingredients to a WITHOUT ROWID table...")
+        cursor.execute("SAVEPOINT recipe_ingredients_without_rowid")
+        try:
+            cursor.execute("""
+                CREATE TABLE recipe_ingredients_new (
+                    recipe_name TEXT NOT NULL,
+                    ingredient_name TEXT NOT NULL,
+                    quantity REAL NOT NULL,
+                    unit TEXT NOT NULL,
+                    PRIMARY KEY (recipe_name, ingredient_name),
+                    FOREIGN KEY (recipe_name) REFERENCES recipes(name) ON DELETE CASCADE,
+                    FOREIGN KEY (ingredient_name) REFERENCES ingredients(name) ON DELETE CASCADE
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("""
+                INSERT INTO recipe_ingredients_new (recipe_name, ingredient_name, quantity, unit)
+                SELECT recipe_name, ingredient_name, quantity, unit FROM recipe_ingredients
+            """)
+            cursor.execute("DROP TABLE recipe_ingredients")
+            cursor.execute("ALTER TABLE recipe_ingredients_new RENAME TO recipe_ingredients")
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO recipe_ingredients_without_rowid")
+            cursor.execute("RELEASE recipe_ingredients_without_rowid")
+            raise
+        cursor.execute("RELEASE recipe_ingredients_without_rowid")
+        print("Migration completed successfully!")
+
+    # The comma-separated ingredients.allergens value as a JSON array, so
+    # json_each() can split it exactly like str.split(','): pieces are not
+    # trimmed and empty pieces are kept.
+    _ALLERGENS_AS_JSON = r"""'["' || replace(replace(replace(replace(replace(replace(
+        {allergens}, '\', '\\'), '"', '\"'), char(9), '\t'),
+        char(10), '\n'), char(13), '\r'), ',', '","') || '"]'"""
+
+    def _migrate_ingredient_allergens(self, conn: sqlite3.Connection):
+        """Mirror ingredients.allergens into the ingredient_allergens junction table.
+
+        The CSV column stays the source of truth (the web views write it
+        directly); triggers keep one row per (ingredient, allergen code) in
+        step with it so allergen queries can join instead of splitting strings.
+        """
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(ingredients)")
+        if 'allergens' not in [col[1] for col in cursor.fetchall()]:
+            return
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ingredient_allergens'")
+        backfill = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingredient_allergens (
+                ingredient_name TEXT NOT NULL,
+                allergen_code TEXT NOT NULL,
+                PRIMARY KEY (ingredient_name, allergen_code)
+            ) WITHOUT ROWID
+        """)
+
+        insert_new = f"""
+            DELETE FROM ingredient_allergens WHERE ingredient_name = NEW.name;
+            INSERT OR IGNORE INTO ingredient_allergens (ingredient_name, allergen_code)
+            SELECT NEW.name, value FROM json_each({self._ALLERGENS_AS_JSON.format(allergens='NEW.allergens')})
+            WHERE NEW.allergens != '';
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS ingredient_allergens_insert
+            AFTER INSERT ON ingredients
+            BEGIN
+                {insert_new}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS ingredient_allergens_update
+            AFTER UPDATE OF name, allergens ON ingredients
+            BEGIN
+                DELETE FROM ingredient_allergens WHERE ingredient_name = OLD.name;
+                {insert_new}
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS ingredient_allergens_delete
+            AFTER DELETE ON ingredients
+            BEGIN
+                DELETE FROM ingredient_allergens WHERE ingredient_name = OLD.name;
+            END
+        """)
+
+        if backfill:
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO ingredient_allergens (ingredient_name, allergen_code)
+                SELECT i.name, j.value
+                FROM ingredients i, json_each({self._ALLERGENS_AS_JSON.format(allergens='i.allergens')}) j
+                WHERE i.allergens != ''
+            """)
+
+    def _drop_recipe_allergen_cache(self, conn: sqlite3.Connection):
+        """Remove recipes.cached_allergens and its invalidation triggers if present.
+
+        Earlier versions persisted each recipe's allergens there on read;
+        they are now memoized in memory only, so the triggers would just add
+        work to every write.
+        """
+        cursor = conn.cursor()
+        for trigger in (
+            "recipe_allergen_cache_ri_insert", "recipe_allergen_cache_ri_update",
+            "recipe_allergen_cache_ri_delete", "recipe_allergen_cache_recipe_insert",
+            "recipe_allergen_cache_recipe_rename", "recipe_allergen_cache_recipe_delete",
+            "recipe_allergen_cache_ing_insert", "recipe_allergen_cache_ing_update",
+            "recipe_allergen_cache_ing_delete",
+        ):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        cursor.execute("PRAGMA table_info(recipes)")
+        if 'cached_allergens' in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE recipes DROP COLUMN cached_allergens")
+
+    def update_ingredient_price(self, ingredient_id: int, bulk_price: float) -> bool:
+        """Update the bulk price for an ingredient and recalculate unit price."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+
+                # Get bulk quantity to calculate unit price
+                cursor.execute("SELECT bulk_quantity FROM ingredients WHERE id = ?", (ingredient_id,))
+                result = cursor.fetchone()
+                if not result:
+                    return False
+
+                bulk_quantity = result[0]
+                unit_price = bulk_price / bulk_quantity if bulk_quantity > 0 else 0
+
+                cursor.execute("""
+                    UPDATE ingredients
+                    SET bulk_price = ?, unit_price = ?
+                    WHERE id = ?
+                """, (bulk_price, unit_price, ingredient_id))
+                return True
+        except Exception:
+            return False
+
+    def get_ingredients_by_category(self) -> Dict[str, List[Ingredient]]:
+        """Get ingredients organized by category with alphabetical sorting."""
+        # iter_ingredients() already yields rows ordered by category, name
+        return {category: list(group)
+                for category, group in itertools.groupby(self.iter_ingredients(),
+                                                         key=lambda ing: ing.category)}
+
+    def add_ingredient(self, ingredient: Ingredient) -> bool:
+        """Add a new ingredient to the database."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO ingredients
+                    (name, category, bulk_unit, bulk_quantity, bulk_price, recipe_unit,
+                     unit_price, on_hand, supplier, notes, yield_percent)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (ingredient.name, ingredient.category, ingredient.bulk_unit,
+                      ingredient.bulk_quantity, ingredient.bulk_price, ingredient.recipe_unit,
+                      ingredient.unit_price, ingredient.on_hand, ingredient.supplier,
+                      ingredient.notes, ingredient.yield_percent))
+                return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_ingredients_bulk(self, ingredients: List[Ingredient]) -> int:
+        """Insert many ingredients in one transaction, skipping names that already exist.
+
+        Returns the number of ingredients actually inserted.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR IGNORE INTO ingredients (
+                    name, category, purchase_unit, purchase_price,
+                    inventory_unit, units_per_purchase, cost_per_inventory_unit,
+                    on_hand, par_level,
+                    recipe_unit, recipe_units_per_inventory, yield_percent, cost_per_recipe_unit,
+                    supplier, notes, allergens
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(ing.name, ing.category, ing.purchase_unit, ing.purchase_price,
+                   ing.inventory_unit, ing.units_per_purchase, ing.cost_per_inventory_unit,
+                   ing.on_hand, ing.par_level,
+                   ing.recipe_unit, ing.recipe_units_per_inventory, ing.yield_percent,
+                   ing.cost_per_recipe_unit,
+                   ing.supplier, ing.notes, ing.allergens)
+                  for ing in ingredients])
+            return cursor.rowcount
+
+    def update_ingredient_stock_bulk(self, updates: List[Tuple[int, float]]) -> int:
+        """Set on_hand for many ingredients, given (ingredient_id, quantity) pairs, in one transaction.
+
+        Returns the number of ingredients actually updated.
+        """
+        with self._connect(immediate=True) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("UPDATE ingredients SET on_hand = ? WHERE id = ?",
+                               [(quantity, ingredient_id) for ingredient_id, quantity in updates])
+            return cursor.rowcount
+
+    def update_ingredient_stock_bulk_by_name(self, updates: List[Tuple[str, float]]) -> int:
+        """Set on_hand for many ingredients, given (name, quantity) pairs, in one transaction.
+
+        Returns the number of ingredients actually updated.
+        """
+        with self._connect(immediate=True) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("UPDATE ingredients SET on_hand = ? WHERE name = ?",
+                               [(quantity, name) for name, quantity in updates])
+            return cursor.rowcount
+
+    def update_recipe_prepared_bulk(self, updates: List[Tuple[str, float]]) -> int:
+        """Set prepared_servings for many recipes, given (name, servings) pairs, in one transaction.
+
+        Returns the number of recipes actually updated.
+        """
+        with self._connect(immediate=True) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("UPDATE recipes SET prepared_servings = ? WHERE name = ?",
+                               [(servings, name) for name, servings in updates])
+            return cursor.rowcount
+
+    _INGREDIENT_COLUMNS = """id, name, category,
+                             purchase_unit, purchase_price,
+                             inventory_unit, units_per_purchase, cost_per_inventory_unit, on_hand,
+                             recipe_unit, recipe_units_per_inventory, cost_per_recipe_unit, yield_percent,
+                             par_level, supplier, notes, allergens"""
+
+    def get_ingredients(self, category: str = None) -> List[Ingredient]:
+        """Get all ingredients, optionally filtered by category.
+
+        Rows are memoized until the database changes; every call builds fresh
+        Ingredient objects, so callers may modify them.
+        """
+        cache = self._cache('ingredients')
+        if category not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                if category:
+                    cursor.execute(f"SELECT {self._INGREDIENT_COLUMNS} FROM ingredients "
+                                   "WHERE category = ? ORDER BY name", (category,))
+                else:
+                    cursor.execute(f"SELECT {self._INGREDIENT_COLUMNS} FROM ingredients "
+                                   "ORDER BY category, name")
+                cache[category] = cursor.fetchall()
+        return [Ingredient(*row) for row in cache[category]]
+
+    def iter_ingredients(self, category: str = None, batch_size: int = 1000) -> Iterator[Ingredient]:
+        """Yield ingredients in get_ingredients() order without building the whole list.
+
+        Rows are fetched batch_size at a time; the lock is only held while a
+        batch is read, so a slow consumer does not block other threads.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            if category:
+                cursor.execute(f"SELECT {self._INGREDIENT_COLUMNS} FROM ingredients "
+                               "WHERE category = ? ORDER BY name", (category,))
+            else:
+                cursor.execute(f"SELECT {self._INGREDIENT_COLUMNS} FROM ingredients "
+                               "ORDER BY category, name")
+
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield Ingredient(*row)
+        finally:
+            with self._lock:
+                cursor.close()
+
+    @staticmethod
+    def _contains_pattern(keyword: str) -> str:
+        """LIKE pattern (with ESCAPE '\\') matching names that contain keyword literally."""
+        return "%" + keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+    def get_ingredient(self, name: str) -> Optional[Ingredient]:
+        """Get a single ingredient by name, or None if it does not exist."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {self._INGREDIENT_COLUMNS} FROM ingredients WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return Ingredient(*row) if row else None
+
+    def search_ingredients(self, keyword: str = "", category: str = None) -> List[Ingredient]:
+        """Get ingredients whose name contains keyword, optionally in one category.
+
+        Both matches ignore (ASCII) case; results keep get_ingredients() order.
+        """
+        conditions, params = [], []
+        if keyword:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            params.append(self._contains_pattern(keyword))
+        if category:
+            conditions.append("category = ? COLLATE NOCASE")
+            params.append(category)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {self._INGREDIENT_COLUMNS} FROM ingredients "
+                           f"{where}ORDER BY category, name", params)
+            return [Ingredient(*row) for row in cursor]
+
+    def autocomplete(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get up to limit ingredients and recipes whose name contains query, sorted by name.
+
+        Recipes are offered as 'Preparation' items; on equal names the
+        ingredient comes first. Each side is cut to limit in SQL, so only the
+        rows that can make the final list leave the database.
+        """
+        pattern = self._contains_pattern(query)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM (SELECT 'ingredient', id, name, category, cost_per_recipe_unit, recipe_unit
+                               FROM ingredients WHERE name LIKE ? ESCAPE '\\'
+                               ORDER BY name LIMIT ?)
+                UNION ALL
+                SELECT * FROM (SELECT 'recipe', NULL, name, 'Preparation', 0, 'ea'
+                               FROM recipes WHERE name LIKE ? ESCAPE '\\'
+                               ORDER BY name LIMIT ?)
+                ORDER BY 3, 1
+                LIMIT ?
+            """, (pattern, limit, pattern, limit, limit))
+            return [{'id': id, 'name': name, 'category': category,
+                     'unit_price': unit_price, 'recipe_unit': recipe_unit, 'type': kind}
+                    for kind, id, name, category, unit_price, recipe_unit in cursor]
+
+    def get_categories(self) -> List[str]:
+        """Get the distinct ingredient categories in sorted order."""
+        cache = self._cache('categories')
+        if 'list' not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT DISTINCT category FROM ingredients ORDER BY category")
+                cache['list'] = [row[0] for row in cursor]
+        return list(cache['list'])
+
+    def get_ingredient_usage_map(self) -> Dict[str, int]:
+        """Get {name: 1 if any recipe or plate uses the ingredient else 0}."""
+        cache = self._cache('ingredient_usage')
+        if 'map' not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT i.name,
+                           EXISTS (SELECT 1 FROM recipe_ingredients ri WHERE ri.ingredient_name = i.name)
+                           OR EXISTS (SELECT 1 FROM plate_ingredients pi WHERE pi.ingredient_name = i.name)
+                    FROM ingredients i
+                """)
+                cache['map'] = dict(cursor.fetchall())
+        return dict(cache['map'])
+
+    def get_ingredient_costs(self) -> Dict[str, Tuple[float, str]]:
+        """Get {name: (cost_per_recipe_unit, recipe_unit)} for every ingredient.
+
+        Memoized until the database changes; callers get a copy.
+        """
+        cache = self._cache('ingredient_costs')
+        if 'all' not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT name, cost_per_recipe_unit, recipe_unit FROM ingredients")
+                cache['all'] = {name: (cost, recipe_unit) for name, cost, recipe_unit in cursor}
+        return dict(cache['all'])
+
+    def add_recipe(self, recipe: Recipe) -> bool:
+        """Add a new recipe to the database."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO recipes (name, servings, q_factor, description, prep_time, cook_time, instructions, whole_unit)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (recipe.name, recipe.servings, recipe.q_factor, recipe.description,
+                      recipe.prep_time, recipe.cook_time, recipe.instructions, recipe.whole_unit))
+                return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def get_recipes(self, limit: Optional[int] = None) -> List[Recipe]:
+        """Get all recipes (or the first limit of them) in name order.
+
+        Rows are memoized until the database changes; callers get fresh Recipe objects.
+        """
+        cache = self._cache('recipes')
+        if limit not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT name, servings, q_factor, description, prep_time, cook_time, instructions, whole_unit FROM recipes ORDER BY name LIMIT ?",
+                               (-1 if limit is None else limit,))
+                cache[limit] = cursor.fetchall()
+        return [Recipe(*row) for row in cache[limit]]
+
+    def get_dashboard_stats(self) -> Dict[str, Any]:
+        """Get record counts, average servings and on-hand inventory value for the dashboard."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT (SELECT COUNT(*) FROM ingredients),
+                       (SELECT COUNT(DISTINCT category) FROM ingredients),
+                       (SELECT TOTAL(on_hand * cost_per_inventory_unit) FROM ingredients),
+                       (SELECT COUNT(*) FROM plates),
+                       COUNT(*), SUM(servings)
+                FROM recipes
+            """)
+            (total_ingredients, categories, inventory_value,
+             total_plates, total_recipes, total_servings) = cursor.fetchone()
+            return {
+                'total_ingredients': total_ingredients,
+                'total_recipes': total_recipes,
+                'total_plates': total_plates,
+                'categories': categories,
+                'avg_recipe_servings': round(total_servings / total_recipes, 1) if total_recipes else 0,
+                'total_inventory_value': round(inventory_value, 2)
+            }
+
+    def get_recipe(self, name: str) -> Optional[Recipe]:
+        """Get a single recipe by name, or None if it does not exist."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name, servings, q_factor, description, prep_time, cook_time, instructions, whole_unit FROM recipes WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return Recipe(*row) if row else None
+
+    def update_recipe(self, original_name: str, recipe: Recipe) -> bool:
+        """Update an existing recipe."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE recipes
+                    SET name = ?, servings = ?, q_factor = ?, description = ?,
+                        prep_time = ?, cook_time = ?, instructions = ?, whole_unit = ?
+                    WHERE name = ?
+                """, (recipe.name, recipe.servings, recipe.q_factor, recipe.description,
+                      recipe.prep_time, recipe.cook_time, recipe.instructions, recipe.whole_unit, original_name))
+
+                # If recipe name changed, update recipe_ingredients table
+                if original_name != recipe.name:
+                    cursor.execute("""
+                        UPDATE recipe_ingredients
+                        SET recipe_name = ?
+                        WHERE recipe_name = ?
+                    """, (recipe.name, original_name))
+                return cursor.rowcount > 0
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_recipe_ingredient(self, recipe_ingredient: RecipeIngredient) -> bool:
+        """Add an ingredient to a recipe."""
+        return self.add_recipe_ingredients([recipe_ingredient])
+
+    def add_recipe_ingredients(self, recipe_ingredients: List[RecipeIngredient]) -> bool:
+        """Add several recipe ingredients in a single transaction."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.executemany("""
+                    INSERT INTO recipe_ingredients
+                    (recipe_name, ingredient_name, quantity, unit)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (recipe_name, ingredient_name)
+                    DO UPDATE SET quantity = excluded.quantity, unit = excluded.unit
+                """, [(ri.recipe_name, ri.ingredient_name, ri.quantity, ri.unit)
+                      for ri in recipe_ingredients])
+                return True
+        except sqlite3.Error:
+            return False
+
+    def get_recipe_ingredients(self, recipe_name: str) -> List[RecipeIngredient]:
+        """Get all ingredients for a specific recipe."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT recipe_name, ingredient_name, quantity, unit
+                FROM recipe_ingredients
+                WHERE recipe_name = ?
+                ORDER BY ingredient_name
+            """, (recipe_name,))
+            return [RecipeIngredient(*row) for row in cursor]
+
+    def get_recipe_ingredients_bulk(self, recipe_names: List[str]) -> Dict[str, List[RecipeIngredient]]:
+        """Get the ingredients of several recipes with one query, keyed by recipe name."""
+        ingredients = {name: [] for name in recipe_names}
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT recipe_name, ingredient_name, quantity, unit
+                FROM recipe_ingredients
+                WHERE recipe_name IN (SELECT value FROM json_each(?))
+                ORDER BY recipe_name, ingredient_name
+            """, (json.dumps(list(ingredients)),))
+            for row in cursor:
+                ingredients[row[0]].append(RecipeIngredient(*row))
+        return ingredients
+
+    def get_recipe_ingredients_with_stock(self, recipe_name: str) -> List[RecipeIngredient]:
+        """Get a recipe's ingredients with on_hand filled from the ingredients table (0 if unknown)."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT ri.recipe_name, ri.ingredient_name, ri.quantity, ri.unit,
+                       IFNULL(i.on_hand, 0)
+                FROM recipe_ingredients ri
+                LEFT JOIN ingredients i ON i.name = ri.ingredient_name
+                WHERE ri.recipe_name = ?
+                ORDER BY ri.ingredient_name
+            """, (recipe_name,))
+            return [RecipeIngredient(*row) for row in cursor]
+
+    # Every recipe named in the JSON array parameter with its ingredient cost
+    # rows, grouped by recipe; recipes without ingredients give one NULL row
+    _RECIPE_COST_SQL = """
+        SELECT r.name, r.servings, r.prep_factor,
+               ri.ingredient_name, ri.quantity, ri.unit,
+               i.cost_per_recipe_unit, i.recipe_unit
+        FROM recipes r
+        LEFT JOIN recipe_ingredients ri ON ri.recipe_name = r.name
+        LEFT JOIN ingredients i ON ri.ingredient_name = i.name
+        WHERE r.name IN (SELECT value FROM json_each(?))
+        ORDER BY r.name, ri.ingredient_name
+    """
+
+    def calculate_recipe_cost(self, recipe_name: str) -> Dict[str, Any]:
+        """Calculate the total cost and cost per serving for a recipe."""
+        return self.calculate_recipe_costs([recipe_name])[recipe_name]
+
+    def calculate_recipe_costs(self, recipe_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Calculate costs for several recipes, keyed by name, with one query.
+
+        Results are memoized until the database changes and only recipes not
+        yet memoized are read; callers get copies. Raises ValueError for the
+        first name that is not a recipe.
+        """
+        cache = self._cache('recipe_cost')
+        missing = [name for name in dict.fromkeys(recipe_names) if name not in cache]
+        if missing:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(self._RECIPE_COST_SQL, (json.dumps(missing),))
+                for name, rows in itertools.groupby(cursor, key=lambda row: row[0]):
+                    cache[name] = self._recipe_cost_from_rows(name, rows)
+
+        costs = {}
+        for name in recipe_names:
+            if name not in cache:
+                raise ValueError(f"Recipe '{name}' not found")
+            cost_data = cache[name]
+            costs[name] = dict(cost_data, ingredient_breakdown=[dict(item) for item in cost_data['ingredient_breakdown']])
+        return costs
+
+    def _recipe_cost_from_rows(self, recipe_name: str, rows: Iterator[tuple]) -> Dict[str, Any]:
+        """Build one recipe's cost summary from its _RECIPE_COST_SQL rows."""
+        first_row = next(rows)
+        servings, prep_factor = first_row[1:3]
+        if prep_factor is None:
+            prep_factor = 0.10
+
+        ingredient_costs = []
+        total_cents = 0
+        convert = self.converter.convert
+        normalize = self.converter.normalize
+
+        for row in itertools.chain((first_row,), rows):
+            _, _, _, ing_name, quantity, unit, cost_per_recipe_unit, recipe_unit = row
+            if recipe_unit is None:
+                # No ingredients, or a sub-recipe / unknown ingredient row
+                continue
+
+            try:
+                # Convert quantity to recipe unit for calculation; compare
+                # canonical names so 'tsp' vs 't' takes the no-op path
+                from_unit = normalize(unit)
+                to_unit = normalize(recipe_unit)
+                if from_unit != to_unit:
+                    converted_quantity = convert(quantity, from_unit, to_unit)
+                else:
+                    converted_quantity = quantity
+
+                # Calculate cost (cost_per_recipe_unit already includes yield)
+                ingredient_cost = cost_per_recipe_unit * converted_quantity
+
+                # Round up sub-cent costs to $0.01 minimum
+                cents = _cost_to_cents(ingredient_cost)
+
+            except ValueError as e:
+                # Conversion failed - use fallback cost to avoid giving ingredients away
+                print(f"Warning: {e}")
+                print(f"  Using fallback cost for {ing_name}: cost_per_recipe_unit * quantity = ${cost_per_recipe_unit} * {quantity}")
+
+                # Fallback: charge cost_per_recipe_unit * quantity directly, with $0.01 minimum
+                ingredient_cost = cost_per_recipe_unit * quantity
+                if ingredient_cost < 0.01:
+                    cents = 1
+                else:
+                    cents = _to_cents(ingredient_cost)
+
+            # Always include ingredient in cost, even if conversion failed
+            total_cents += cents
+
+            ingredient_costs.append({
+                'name': ing_name,
+                'quantity': quantity,
+                'unit': unit,
+                'cost': cents / 100
+            })
+
+        # Apply prep_factor (labor, special equipment, planning) to the dollar
+        # total summed as before, so half-cent prep costs round as they always did
+        if not servings:
+            raise ValueError(f"Recipe '{recipe_name}' has no servings to divide the cost by")
+        prep_factor_cents = _to_cents(sum(item['cost'] for item in ingredient_costs) * prep_factor)
+        total_with_prep_cents = total_cents + prep_factor_cents
+
+        # Per serving comes from the unrounded total in a single rounding step,
+        # done in integers with prep_factor in basis points; half cents go to
+        # the even cent like round()
+        prep_factor_bp = round(prep_factor * 10000)
+        denominator = 10000 * servings
+        cost_per_serving_cents, remainder = divmod(total_cents * (10000 + prep_factor_bp), denominator)
+        if 2 * remainder > denominator or (2 * remainder == denominator and cost_per_serving_cents % 2):
+            cost_per_serving_cents += 1
+
+        return {
+            'recipe_name': recipe_name,
+            'servings': servings,
+            'ingredient_cost': total_cents / 100,
+            'prep_factor': prep_factor,
+            'prep_factor_cost': prep_factor_cents / 100,
+            'total_cost': total_with_prep_cents / 100,
+            'cost_per_serving': cost_per_serving_cents / 100,
+            'ingredient_breakdown': ingredient_costs
+        }
+
+    # Allergen Management Methods
+    # (allergen code, owner) for everything reachable from the {seed} rows.
+    # Each walk row is (owner, name, expand, reached): owner is carried
+    # along unchanged so one query can walk several plates; a name is
+    # expanded further only when it is a recipe and not an ingredient that
+    # already carries allergens, and only reached rows contribute their own
+    # allergens. UNION drops repeated rows, which also stops cycles.
+    _ALLERGEN_WALK_SQL = """
+        WITH RECURSIVE walk(owner, name, expand, reached) AS (
+            {seed}
+            UNION
+            SELECT w.owner, ri.ingredient_name,
+                   NOT EXISTS (SELECT 1 FROM ingredient_allergens ia
+                               WHERE ia.ingredient_name = ri.ingredient_name)
+                   AND EXISTS (SELECT 1 FROM recipes r WHERE r.name = ri.ingredient_name),
+                   1
+            FROM walk w
+            JOIN recipe_ingredients ri ON ri.recipe_name = w.name
+            WHERE w.expand
+        )
+        SELECT DISTINCT ia.allergen_code, w.owner
+        FROM walk w
+        JOIN ingredient_allergens ia ON ia.ingredient_name = w.name
+        WHERE w.reached
+    """
+    # Built once so every call passes the identical text to the statement cache
+    _RECIPE_ALLERGENS_SQL = _ALLERGEN_WALK_SQL.format(seed="SELECT NULL, ?, 1, 0")
+    # Recipes on the plate are walked like get_recipe_allergens does;
+    # direct ingredients only contribute their own allergens.
+    _PLATE_ALLERGENS_SQL = _ALLERGEN_WALK_SQL.format(seed="""
+        SELECT NULL, recipe_name, 1, 0 FROM plate_recipes WHERE plate_name = ?
+        UNION
+        SELECT NULL, ingredient_name, 0, 1 FROM plate_ingredients WHERE plate_name = ?
+    """)
+    # The same walk for every plate at once, owned by plate name
+    _ALL_PLATE_ALLERGENS_SQL = _ALLERGEN_WALK_SQL.format(seed="""
+        SELECT plate_name, recipe_name, 1, 0 FROM plate_recipes
+        UNION
+        SELECT plate_name, ingredient_name, 0, 1 FROM plate_ingredients
+    """)
+
+    def get_recipe_allergens(self, recipe_name: str) -> set:
+        """Get all allergens present in a recipe (recursively checks sub-recipes)."""
+        cache = self._cache('recipe_allergens')
+        if recipe_name in cache:
+            return set(cache[recipe_name])
+
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._RECIPE_ALLERGENS_SQL, (recipe_name,))
+            allergens = {row[0] for row in cursor}
+
+        cache[recipe_name] = frozenset(allergens)
+        return allergens
+
+    def get_plate_allergens(self, plate_name: str) -> set:
+        """Get all allergens present in a plate (from recipes and direct ingredients)."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._PLATE_ALLERGENS_SQL, (plate_name, plate_name))
+            return {row[0] for row in cursor}
+
+    def get_all_plate_allergens(self) -> Dict[str, set]:
+        """Get {plate_name: allergens} for every plate that has any, in one query."""
+        cache = self._cache('plate_allergens')
+        if 'all' not in cache:
+            plate_allergens = {}
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(self._ALL_PLATE_ALLERGENS_SQL)
+                for allergen_code, plate_name in cursor:
+                    plate_allergens.setdefault(plate_name, set()).add(allergen_code)
+            cache['all'] = plate_allergens
+        return {plate_name: set(allergens) for plate_name, allergens in cache['all'].items()}
+
+    def get_allergen_infos(self) -> Dict[str, Dict[str, str]]:
+        """Get {code: {code, name, icon, description}} for every allergen."""
+        cache = self._cache('allergen_info')
+        if 'all' not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT code, name, icon, description FROM allergens")
+                cache['all'] = {
+                    code: {'code': code, 'name': name, 'icon': icon, 'description': description}
+                    for code, name, icon, description in cursor
+                }
+        return {code: dict(info) for code, info in cache['all'].items()}
+
+    def get_allergen_info(self, allergen_code: str) -> Dict[str, str]:
+        """Get information about a specific allergen."""
+        return self.get_allergen_infos().get(allergen_code)
+
+    # Plate Management Methods
+    def get_plates(self) -> List[Plate]:
+        """Get all plates (rows memoized until the database changes)."""
+        cache = self._cache('plates')
+        if 'rows' not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT name, category, description FROM plates ORDER BY category, name")
+                cache['rows'] = cursor.fetchall()
+        return [Plate(*row) for row in cache['rows']]
+
+    def get_plate(self, name: str) -> Optional[Plate]:
+        """Get a single plate by name, or None if it does not exist."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name, category, description FROM plates WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return Plate(*row) if row else None
+
+    def get_plate_categories(self) -> List[Dict[str, Any]]:
+        """Get plate categories in display order, each with its plate count."""
+        cache = self._cache('plate_categories')
+        if 'list' not in cache:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT
+                        pc.id,
+                        pc.name,
+                        pc.display_order,
+                        COUNT(p.name) as plate_count
+                    FROM plate_categories pc
+                    LEFT JOIN plates p ON p.category = pc.name
+                    GROUP BY pc.id, pc.name, pc.display_order
+                    ORDER BY pc.display_order
+                """)
+
+                cache['list'] = [{'id': id, 'name': name, 'display_order': display_order,
+                                  'plate_count': plate_count}
+                                 for id, name, display_order, plate_count in cursor]
+        return [dict(category) for category in cache['list']]
+
+    def add_plate(self, plate: Plate) -> bool:
+        """Add a new plate to the database."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO plates (name, category, description)
+                    VALUES (?, ?, ?)
+                """, (plate.name, plate.category, plate.description))
+                return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def get_plate_ingredients(self, plate_name: str) -> List[PlateIngredient]:
+        """Get all ingredients for a specific plate."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT plate_name, ingredient_name, quantity, unit
+                FROM plate_ingredients
+                WHERE plate_name = ?
+                ORDER BY ingredient_name
+            """, (plate_name,))
+            return [PlateIngredient(*row) for row in cursor]
+
+    def get_plate_ingredients_bulk(self, plate_names: List[str]) -> Dict[str, List[PlateIngredient]]:
+        """Get the ingredients of several plates with one query, keyed by plate name."""
+        ingredients = {name: [] for name in plate_names}
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT plate_name, ingredient_name, quantity, unit
+                FROM plate_ingredients
+                WHERE plate_name IN (SELECT value FROM json_each(?))
+                ORDER BY plate_name, ingredient_name
+            """, (json.dumps(list(ingredients)),))
+            for row in cursor:
+                ingredients[row[0]].append(PlateIngredient(*row))
+        return ingredients
+
+    def add_plate_ingredient(self, plate_ingredient: PlateIngredient) -> bool:
+        """Add an ingredient to a plate."""
+        return self.add_plate_ingredients([plate_ingredient])
+
+    # Rows per multi-row INSERT: 4 parameters each keeps a statement well
+    # under SQLite's default 999 bound-parameter limit
+    _PLATE_INGREDIENT_BATCH = 200
+
+    def add_plate_ingredients(self, plate_ingredients: List[PlateIngredient]) -> bool:
+        """Add several plate ingredients in a single transaction."""
+        batch = self._PLATE_INGREDIENT_BATCH
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(plate_ingredients), batch):
+                    chunk = plate_ingredients[start:start + batch]
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO plate_ingredients"
+                        " (plate_name, ingredient_name, quantity, unit) VALUES "
+                        + ", ".join(["(?, ?, ?, ?)"] * len(chunk)),
+                        [value for pi in chunk
+                         for value in (pi.plate_name, pi.ingredient_name, pi.quantity, pi.unit)])
+                return True
+        except sqlite3.Error:
+            return False
+
+    # Plate ingredient rows with their cost already converted to the recipe
+    # unit (cost_per_recipe_unit already includes yield). ingredient_cost is
+    # NULL when temp.unit_conversions has no factor for the pair.
+    _PLATE_INGREDIENT_COSTS_SQL = """
+        SELECT pi.plate_name, pi.ingredient_name, pi.quantity, pi.unit,
+               i.cost_per_recipe_unit, i.recipe_unit,
+               CASE WHEN pi.unit = i.recipe_unit THEN pi.quantity * i.cost_per_recipe_unit
+                    ELSE pi.quantity * uc.factor * i.cost_per_recipe_unit
+               END AS ingredient_cost
+        FROM plate_ingredients pi
+        JOIN ingredients i ON pi.ingredient_name = i.name
+        LEFT JOIN temp.unit_conversions uc
+               ON uc.from_unit = pi.unit AND uc.to_unit = i.recipe_unit
+    """
+    _PLATE_INGREDIENT_COSTS_SQL_FOR_PLATE = _PLATE_INGREDIENT_COSTS_SQL + " WHERE pi.plate_name = ?"
+
+    def calculate_plate_cost(self, plate_name: str) -> Dict[str, Any]:
+        """Calculate the total cost for a plate/menu item."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+
+            # Get plate info
+            cursor.execute("SELECT name, category, description FROM plates WHERE name = ?", (plate_name,))
+            plate_data = cursor.fetchone()
+            if not plate_data:
+                raise ValueError(f"Plate '{plate_name}' not found")
+
+            # Get plate ingredients with their costs
+            cursor.execute(self._PLATE_INGREDIENT_COSTS_SQL_FOR_PLATE, (plate_name,))
+
+            ingredient_costs = []
+            total_cents = 0
+
+            for ing_data in cursor:
+                _, ing_name, quantity, unit, cost_per_recipe_unit, recipe_unit, ingredient_cost = ing_data
+
+                try:
+                    if ingredient_cost is None:
+                        # No stored factor for this unit pair: let the converter
+                        # resolve aliases of the same unit or raise
+                        converted_quantity = self.converter.convert(quantity, unit, recipe_unit)
+                        ingredient_cost = converted_quantity * cost_per_recipe_unit
+
+                    # Round up sub-cent costs to $0.01 minimum
+                    cents = _cost_to_cents(ingredient_cost)
+
+                    # Summed in whole cents, like price_all_plates
+                    total_cents += cents
+
+                    ingredient_costs.append({
+                        'name': ing_name,
+                        'quantity': quantity,
+                        'unit': unit,
+                        'cost': cents / 100
+                    })
+
+                except Exception as e:
+                    print(f"Warning: Could not calculate cost for {ing_name}: {e}")
+                    ingredient_costs.append({
+                        'name': ing_name,
+                        'quantity': quantity,
+                        'unit': unit,
+                        'cost': 0.0
+                    })
+
+            # NOTE: Recipe costs from plate_recipes table are calculated separately
+            # in web_app.py to avoid double-counting. This function only returns
+            # direct ingredient costs from plate_ingredients table.
+
+            # Use default q_factor for plates
+            q_factor = 0.04
+            total_ingredient_cost = total_cents / 100
+            q_factor_cost = total_ingredient_cost * q_factor
+            total_with_q = total_ingredient_cost + q_factor_cost
+
+            return {
+                'plate_name': plate_name,
+                'category': plate_data[1],
+                'description': plate_data[2],
+                'ingredient_cost': round(total_ingredient_cost, 2),
+                'q_factor': q_factor,
+                'q_factor_cost': round(q_factor_cost, 2),
+                'total_cost': round(total_with_q, 2),
+                'ingredient_breakdown': ingredient_costs
+            }
+
+    def price_all_plates(self) -> Dict[str, float]:
+        """Get the total cost (with q_factor) of every plate.
+
+        Applies the same per-ingredient conversion and rounding rules as
+        calculate_plate_cost, without a query per plate.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM plates")
+            plate_cents: Dict[str, int] = dict.fromkeys((row[0] for row in cursor), 0)
+
+            convert = self.converter.convert
+            cursor.execute(self._PLATE_INGREDIENT_COSTS_SQL)
+            for plate_name, _, quantity, unit, cost_per_recipe_unit, recipe_unit, ingredient_cost in cursor:
+                if plate_name not in plate_cents:
+                    # Leftover rows for a plate that no longer exists
+                    continue
+
+                if ingredient_cost is None:
+                    try:
+                        ingredient_cost = convert(quantity, unit, recipe_unit) * cost_per_recipe_unit
+                    except Exception:
+                        # Same as calculate_plate_cost: uncosted ingredients count as $0
+                        continue
+
+                # Round up sub-cent costs to $0.01 minimum
+                plate_cents[plate_name] += _cost_to_cents(ingredient_cost)
+
+        # Use default q_factor for plates
+        q_factor = 0.04
+        totals = {}
+        for plate_name, cents in plate_cents.items():
+            total_ingredient_cost = cents / 100
+            totals[plate_name] = round(total_ingredient_cost + total_ingredient_cost * q_factor, 2)
+        return totals
+
+
+class RecipeManagementSystem:
+    """Main RMS application class with CLI interface."""
+
+    def __init__(self):
+        self.db = DatabaseManager()
+        self.commands = {
+            '01': self.add_recipe,
+            '02': self.list_recipes,
+            '03': self.delete_recipe,
+            '04': self.calculate_recipe_cost,
+            '05': self.scale_recipe,
+            '11': self.add_ingredient,
+            '12': self.list_ingredients,
+            '13': self.search_ingredients,
+            '14': self.update_ingredient,
+            '21': self.add_recipe_ingredient,
+            '22': self.show_recipe_ingredients,
+            '23': self.remove_recipe_ingredient,
+            '31': self.import_legacy_data,
+            '99': self.show_help
+        }
+
+    def run(self):
+        """Main application loop."""
+        print("🍳 Modern Recipe Management System v2.0")
+        print("=" * 50)
+        self.show_help()
+
+        while True:
+            try:
+                command = self._prompt("\n📋 Enter command (99 for help, 'quit' to exit): ").strip()
+
+                if command.lower() in ['quit', 'exit', 'q']:
+                    print("👋 Goodbye!")
+                    break
+
+                if command in self.commands:
+                    self.commands[command]()
+                else:
+                    print("❌ Invalid command. Type '99' for help.")
+
+            except (KeyboardInterrupt, EOFError):
+                print("\n👋 Goodbye!")
+                break
+            except Exception as e:
+                print(f"❌ Error: {e}")
+
+    @staticmethod
+    def _prompt(text: str) -> str:
+        """Read one line from stdin after writing a prompt, like input() without the readline hooks.
+
+        Raises EOFError at end of input so piped sessions end instead of looping.
+        """
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
+
+    def show_help(self):
+        """Display available commands."""
+        help_text = """
+📖 Available Commands:
+┌─────────────────────────────────────────────────────────────┐
+│ RECIPES                                                     │
+│ 01 - Add new recipe           02 - List all recipes        │
+│ 03 - Delete recipe            04 - Calculate recipe cost   │
+│ 05 - Scale recipe for events                               │
+│                                                             │
+│ INGREDIENTS                                                 │
+│ 11 - Add new ingredient       12 - List ingredients        │
+│ 13 - Search ingredients       14 - Update ingredient       │
+│                                                             │
+│ RECIPE INGREDIENTS                                          │
+│ 21 - Add ingredient to recipe 22 - Show recipe ingredients │
+│ 23 - Remove ingredient from recipe                         │
+│                                                             │
+│ DATA MANAGEMENT                                             │
+│ 31 - Import legacy JSON data                               │
+│                                                             │
+│ HELP                                                        │
+│ 99 - Show this help menu                                   │
+└─────────────────────────────────────────────────────────────┘
+        """
+        print(help_text)
+
+    def add_recipe(self):
+        """Add a new recipe."""
+        print("\n🆕 Add New Recipe")
+        name = self._prompt("Recipe name: ").strip()
+        if not name:
+            print("❌ Recipe name cannot be empty")
+            return
+
+        try:
+            servings = int(self._prompt("Number of servings: "))
+            description = self._prompt("Description (optional): ").strip()
+            prep_time = int(self._prompt("Prep time in minutes (0 for unknown): ") or "0")
+            cook_time = int(self._prompt("Cook time in minutes (0 for unknown): ") or "0")
+            q_factor = float(self._prompt("Q-factor (default 0.04): ") or "0.04")
+
+            recipe = Recipe(name, servings, q_factor, description, prep_time, cook_time)
+
+            if self.db.add_recipe(recipe):
+                print(f"✅ Recipe '{name}' added successfully!")
+            else:
+                print(f"❌ Recipe '{name}' already exists")
+
+        except ValueError:
+            print("❌ Invalid input. Please enter numeric values where required.")
+
+    def list_recipes(self):
+        """List all recipes."""
+        recipes = self.db.get_recipes()
+        if not recipes:
+            print("📭 No recipes found")
+            return
+
+        print(f"\n📚 Found {len(recipes)} recipes:")
+
+        table_data = []
+        for recipe in recipes:
+            total_time = recipe.prep_time + recipe.cook_time
+            time_str = f"{total_time}m" if total_time > 0 else "Unknown"
+            table_data.append([
+                recipe.name,
+                recipe.servings,
+                f"{recipe.q_factor:.1%}",
+                time_str,
+                recipe.description[:50] + "..." if len(recipe.description) > 50 else recipe.description
+            ])
+
+        print(tabulate(table_data,
+                      headers=["Recipe", "Servings", "Q-Factor", "Time", "Description"],
+                      tablefmt="grid"))
+
+    def calculate_recipe_cost(self):
+        """Calculate and display recipe cost."""
+        recipe_name = self._prompt("Recipe name: ").strip()
+        if not recipe_name:
+            print("❌ Recipe name cannot be empty")
+            return
+
+        try:
+            cost_data = self.db.calculate_recipe_cost(recipe_name)
+
+            print(f"\n💰 Cost Analysis for '{recipe_name}'")
+            print("=" * 50)
+            print(f"Servings: {cost_data['servings']}")
+            print(f"Ingredient Cost: ${cost_data['ingredient_cost']:.2f}")
+            print(f"Q-Factor ({cost_data['q_factor']:.1%}): ${cost_data['q_factor_cost']:.2f}")
+            print(f"Total Cost: ${cost_data['total_cost']:.2f}")
+            print(f"Cost per Serving: ${cost_data['cost_per_serving']:.2f}")
+
+            print("\n📋 Ingredient Breakdown:")
+            table_data = []
+            for item in cost_data['ingredient_breakdown']:
+                table_data.append([
+                    item['name'],
+                    f"{item['quantity']} {item['unit']}",
+                    f"${item['cost']:.2f}"
+                ])
+
+            print(tabulate(table_data,
+                          headers=["Ingredient", "Quantity", "Cost"],
+                          tablefmt="grid"))
+
+        except ValueError as e:
+            print(f"❌ {e}")
+
+    def add_ingredient(self):
+        """Add a new ingredient."""
+        print("\n🥕 Add New Ingredient")
+        name = self._prompt("Ingredient name: ").strip().title()
+        if not name:
+            print("❌ Ingredient name cannot be empty")
+            return
+
+        category = self._prompt("Category: ").strip().lower()
+
+        try:
+            unit_price = float(self._prompt("Unit price ($): "))
+            purchase_unit = self._prompt("Purchase unit (e.g., lb, gal): ").strip()
+            on_hand = float(self._prompt("Quantity available: "))
+            conversion_density = float(self._prompt("Conversion density: "))
+            base_unit = self._prompt("Base unit for recipes: ").strip()
+            yield_percent = float(self._prompt("Yield percentage (default 95): ") or "95")
+
+            ingredient = Ingredient(
+                id=0,  # Auto-generated
+                name=name,
+                category=category,
+                unit_price=unit_price,
+                purchase_unit=purchase_unit,
+                on_hand=on_hand,
+                conversion_density=conversion_density,
+                base_unit=base_unit,
+                yield_percent=yield_percent
+            )
+
+            if self.db.add_ingredient(ingredient):
+                print(f"✅ Ingredient '{name}' added successfully!")
+            else:
+                print(f"❌ Ingredient '{name}' already exists")
+
+        except ValueError:
+            print("❌ Invalid input. Please enter numeric values where required.")
+
+    def list_ingredients(self):
+        """List all ingredients."""
+        table_data = [
+            [
+                ing.name,
+                ing.category.title(),
+                f"${ing.purchase_price:.2f}",
+                ing.purchase_unit,
+                f"${ing.cost_per_recipe_unit:.3f}",
+                ing.recipe_unit,
+                f"{ing.yield_percent:.1f}%"
+            ]
+            for ing in self.db.iter_ingredients()
+        ]
+        if not table_data:
+            print("📭 No ingredients found")
+            return
+
+        print(f"\n🥘 Found {len(table_data)} ingredients:")
+
+        print(tabulate(table_data,
+                      headers=["Ingredient", "Category", "Unit Price", "P.Unit", "Adj.Price", "Base Unit", "Yield"],
+                      tablefmt="grid"))
+
+    def add_recipe_ingredient(self):
+        """Add an ingredient to a recipe."""
+        recipe_name = self._prompt("Recipe name: ").strip()
+        ingredient_name = self._prompt("Ingredient name: ").strip().title()
+
+        try:
+            quantity = float(self._prompt("Quantity: "))
+            unit = self._prompt("Unit: ").strip()
+
+            recipe_ingredient = RecipeIngredient(recipe_name, ingredient_name, quantity, unit)
+
+            if self.db.add_recipe_ingredient(recipe_ingredient):
+                print(f"✅ Added {quantity} {unit} of {ingredient_name} to {recipe_name}")
+            else:
+                print("❌ Failed to add ingredient to recipe")
+
+        except ValueError:
+            print("❌ Invalid quantity")
+
+    def show_recipe_ingredients(self):
+        """Show all ingredients in a recipe."""
+        recipe_name = self._prompt("Recipe name: ").strip()
+        ingredients = self.db.get_recipe_ingredients(recipe_name)
+
+        if not ingredients:
+            print(f"📭 No ingredients found for recipe '{recipe_name}'")
+            return
+
+        print(f"\n🍲 Ingredients in '{recipe_name}':")
+        table_data = []
+        for ing in ingredients:
+            table_data.append([ing.ingredient_name, f"{ing.quantity} {ing.unit}"])
+
+        print(tabulate(table_data, headers=["Ingredient", "Quantity"], tablefmt="grid"))
+
+    def scale_recipe(self):
+        """Scale a recipe for different serving sizes."""
+        recipe_name = self._prompt("Recipe name: ").strip()
+        try:
+            new_servings = int(self._prompt("New number of servings: "))
+            cost_data = self.db.calculate_recipe_cost(recipe_name)
+
+            scale_factor = new_servings / cost_data['servings']
+            scaled_cost = cost_data['total_cost'] * scale_factor
+
+            print(f"\n📏 Scaled Recipe: '{recipe_name}' for {new_servings} servings")
+            print(f"Scale Factor: {scale_factor:.2f}x")
+            print(f"Total Cost: ${scaled_cost:.2f}")
+            print(f"Cost per Serving: ${scaled_cost / new_servings:.2f}")
+
+        except (ValueError, KeyError) as e:
+            print(f"❌ Error scaling recipe: {e}")
+
+    def import_legacy_data(self):
+        """Import data from legacy JSON files."""
+        json_file = self._prompt("JSON file path (or 'aladdin' for default): ").strip()
+
+        if json_file == 'aladdin':
+            json_file = 'rms/00_ingredients_aladdin.json'
+
+        if not os.path.exists(json_file):
+            print(f"❌ File '{json_file}' not found")
+            return
+
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+
+            ingredients = []
+            for category, items in data.items():
+                for item in items:
+                    # Legacy rows price one purchase unit (UA) and give the
+                    # recipe units per purchase unit (CD) and the recipe unit (UB)
+                    unit_price = float(item.get('UP', 0))
+                    conversion_density = float(item.get('CD', 1))
+                    yield_percent = 95.0
+                    cost_per_recipe_unit = (unit_price / conversion_density) / (yield_percent / 100.0) if conversion_density > 0 else 0
+                    ingredients.append(Ingredient(
+                        id=0,
+                        name=item.get('Ingredient', '').title(),
+                        category=category,
+                        purchase_unit=item.get('UA', ''),
+                        purchase_price=unit_price,
+                        inventory_unit=item.get('UA', ''),
+                        units_per_purchase=1.0,
+                        cost_per_inventory_unit=unit_price,
+                        on_hand=float(item.get('QA', 1)),
+                        recipe_unit=item.get('UB', ''),
+                        recipe_units_per_inventory=conversion_density,
+                        cost_per_recipe_unit=cost_per_recipe_unit,
+                        yield_percent=yield_percent
+                    ))
+
+            imported_count = self.db.add_ingredients_bulk(ingredients)
+            print(f"✅ Imported {imported_count} ingredients from {json_file}")
+
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            print(f"❌ Error importing data: {e}")
+
+    def search_ingredients(self):
+        """Search for ingredients by name."""
+        keyword = self._prompt("Search keyword: ").strip().lower()
+        matches = self.db.search_ingredients(keyword)
+
+        if not matches:
+            print(f"🔍 No ingredients found matching '{keyword}'")
+            return
+
+        print(f"\n🔍 Found {len(matches)} ingredients matching '{keyword}':")
+        table_data = []
+        for ing in matches:
+            table_data.append([ing.name, ing.category.title(), f"${ing.purchase_price:.2f}", ing.purchase_unit])
+
+        print(tabulate(table_data, headers=["Ingredient", "Category", "Price", "Unit"], tablefmt="grid"))
+
+    def delete_recipe(self):
+        """Delete a recipe (placeholder)."""
+        print("🚧 Delete recipe feature coming soon!")
+
+    def remove_recipe_ingredient(self):
+        """Remove ingredient from recipe (placeholder)."""
+        print("🚧 Remove recipe ingredient feature coming soon!")
+
+    def update_ingredient(self):
+        """Update ingredient information (placeholder)."""
+        print("🚧 Update ingredient feature coming soon!")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Modern Recipe Management System")
+    parser.add_argument('--version', action='version', version='RMS 2.0')
+    parser.add_argument('--db', default='rms_unified.db', help='Database file path')
+
+    args = parser.parse_args()
+
+    # Initialize and run the application
+    rms = RecipeManagementSystem()
+    rms.run()
+    rms.db.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
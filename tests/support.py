@@ -0,0 +1,153 @@
+"""Shared fixtures: a throwaway database with the deployed schema."""
+
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+
+from rms_modern import DatabaseManager
+
+# The schema of a deployed rms_unified.db before any DatabaseManager
+# migration has run (recipe_ingredients still has its id column)
+BASELINE_SCHEMA = """
+CREATE TABLE ingredients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    category TEXT NOT NULL,
+    purchase_unit TEXT NOT NULL,
+    purchase_price REAL NOT NULL,
+    inventory_unit TEXT NOT NULL,
+    units_per_purchase REAL NOT NULL,
+    cost_per_inventory_unit REAL,
+    on_hand REAL NOT NULL DEFAULT 0,
+    par_level REAL DEFAULT 0,
+    recipe_unit TEXT NOT NULL,
+    recipe_units_per_inventory REAL NOT NULL,
+    yield_percent REAL DEFAULT 95.0,
+    cost_per_recipe_unit REAL,
+    supplier TEXT DEFAULT '',
+    notes TEXT DEFAULT '',
+    allergens TEXT DEFAULT '',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE recipes (
+    name TEXT PRIMARY KEY,
+    servings INTEGER NOT NULL,
+    q_factor REAL DEFAULT 0.04,
+    description TEXT DEFAULT '',
+    prep_time INTEGER DEFAULT 0,
+    cook_time INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    instructions TEXT DEFAULT '',
+    whole_unit INTEGER DEFAULT 0,
+    prep_factor REAL DEFAULT 0.10,
+    unit_based INTEGER DEFAULT 0,
+    prepared_servings REAL DEFAULT 0.0,
+    par_servings REAL DEFAULT 10.0,
+    station TEXT DEFAULT 'Prep'
+);
+CREATE TABLE recipe_ingredients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipe_name TEXT NOT NULL,
+    ingredient_name TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    unit TEXT NOT NULL,
+    FOREIGN KEY (recipe_name) REFERENCES recipes(name) ON DELETE CASCADE,
+    FOREIGN KEY (ingredient_name) REFERENCES ingredients(name) ON DELETE CASCADE,
+    UNIQUE(recipe_name, ingredient_name)
+);
+CREATE TABLE plates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT DEFAULT '',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    q_factor REAL DEFAULT 0.04,
+    display_order INTEGER DEFAULT 0,
+    is_active INTEGER DEFAULT 1
+);
+CREATE TABLE plate_ingredients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plate_name TEXT NOT NULL,
+    ingredient_name TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    unit TEXT NOT NULL,
+    FOREIGN KEY (plate_name) REFERENCES plates (name),
+    UNIQUE(plate_name, ingredient_name)
+);
+CREATE TABLE plate_recipes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plate_name TEXT NOT NULL,
+    recipe_name TEXT NOT NULL,
+    servings REAL NOT NULL DEFAULT 1.0,
+    quantity REAL,
+    unit TEXT,
+    FOREIGN KEY (plate_name) REFERENCES plates (name),
+    FOREIGN KEY (recipe_name) REFERENCES recipes (name),
+    UNIQUE(plate_name, recipe_name)
+);
+CREATE TABLE plate_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    display_order INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE allergens (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    icon TEXT,
+    description TEXT
+);
+"""
+
+
+def create_baseline_database(path, seed_sql=""):
+    """Write a database with BASELINE_SCHEMA (and optional seed rows) to path."""
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA + seed_sql)
+    conn.close()
+
+
+def make_database(test_case, seed_sql=""):
+    """Return a DatabaseManager on a fresh baseline database, cleaned up with test_case."""
+    tmpdir = tempfile.TemporaryDirectory()
+    test_case.addCleanup(tmpdir.cleanup)
+    path = os.path.join(tmpdir.name, "rms_unified.db")
+    create_baseline_database(path, seed_sql)
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Keep the migration progress messages out of the test output
+        db = DatabaseManager(path)
+    test_case.addCleanup(db.close)
+    return db
+
+
+def ingredient_sql(name, cost_per_recipe_unit, recipe_unit="ea", allergens="", on_hand=0):
+    """INSERT for an ingredient whose recipe-unit cost is already known."""
+    return (
+        "INSERT INTO ingredients (name, category, purchase_unit, purchase_price, inventory_unit,"
+        " units_per_purchase, cost_per_inventory_unit, on_hand, recipe_unit,"
+        " recipe_units_per_inventory, cost_per_recipe_unit, allergens)"
+        f" VALUES ('{name}', 'Produce', 'case', 1, 'ea', 1, 1, {on_hand}, '{recipe_unit}', 1,"
+        f" {cost_per_recipe_unit}, '{allergens}');\n"
+    )
+
+
+def make_client(test_case, seed_sql=""):
+    """Return (web_app test client, DatabaseManager) serving a fresh baseline database."""
+    import web_app
+
+    db = make_database(test_case, seed_sql)
+    patcher = mock.patch.object(web_app, 'db_manager', db)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    web_app.app.testing = True
+    return web_app.app.test_client(), db
+
+
+def flashes(client):
+    """The (category, message) pairs flashed so far in client's session."""
+    with client.session_transaction() as session:
+        return session.get('_flashes', [])
@@ -0,0 +1,32 @@
+import unittest
+
+from tests.support import ingredient_sql, make_database
+
+
+class RecipeAllergenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = make_database(self, (
+            ingredient_sql('Tahini', 1, allergens='sesame')
+            + ingredient_sql('Chickpeas', 1)
+            + "INSERT INTO recipes (name, servings) VALUES ('Hummus', 4);\n"
+            + "INSERT INTO recipe_ingredients (recipe_name, ingredient_name, quantity, unit) VALUES"
+            + " ('Hummus', 'Tahini', 1, 'ea'), ('Hummus', 'Chickpeas', 2, 'ea');\n"
+        ))
+
+    def test_lookup_does_not_write(self):
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        self.addCleanup(self.db.set_trace_callback, None)
+        self.assertEqual(self.db.get_recipe_allergens('Hummus'), {'sesame'})
+        self.assertFalse([sql for sql in statements if sql.lstrip().upper().startswith('UPDATE')])
+
+    def test_memo_follows_ingredient_changes(self):
+        self.assertEqual(self.db.get_recipe_allergens('Hummus'), {'sesame'})
+        with self.db.connect() as conn:
+            conn.execute("UPDATE ingredients SET allergens = 'sesame,soy' WHERE name = 'Chickpeas'")
+        self.assertEqual(self.db.get_recipe_allergens('Hummus'), {'sesame', 'soy'})
+
+
+if __name__ == '__main__':
+    unittest.main()
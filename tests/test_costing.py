@@ -0,0 +1,78 @@
+import unittest
+
+from rms_modern import _cost_to_cents
+from tests.support import ingredient_sql, make_database
+
+
+def recipe_sql(name, servings, prep_factor, ingredient_cost):
+    """A recipe made of one ingredient that costs exactly ingredient_cost."""
+    return (
+        ingredient_sql(f"{name} Base", ingredient_cost)
+        + f"INSERT INTO recipes (name, servings, prep_factor) VALUES ('{name}', {servings}, {prep_factor});\n"
+        + "INSERT INTO recipe_ingredients (recipe_name, ingredient_name, quantity, unit)"
+        + f" VALUES ('{name}', '{name} Base', 1, 'ea');\n"
+    )
+
+
+class RecipeCostRoundingTest(unittest.TestCase):
+    """Recipe costs stay on the values the float implementation produced."""
+
+    def setUp(self):
+        self.db = make_database(self, (
+            recipe_sql('Hummus', 16, 0.1, 78.47)
+            + recipe_sql('Caesar Dressing', 10, 0.1, 10.45)
+            + recipe_sql('Tabbouleh Recipe', 1, 0.15, 8.70)
+        ))
+
+    def assertCosts(self, name, prep_factor_cost, total_cost, cost_per_serving):
+        cost = self.db.calculate_recipe_cost(name)
+        self.assertEqual(
+            (cost['prep_factor_cost'], cost['total_cost'], cost['cost_per_serving']),
+            (prep_factor_cost, total_cost, cost_per_serving))
+
+    def test_cost_per_serving_is_rounded_once(self):
+        # 86.317 / 16 = 5.3948; rounding the 86.32 total first gave 5.40
+        self.assertCosts('Hummus', 7.85, 86.32, 5.39)
+
+    def test_half_cent_prep_factor_costs(self):
+        self.assertCosts('Caesar Dressing', 1.04, 11.49, 1.15)
+        self.assertCosts('Tabbouleh Recipe', 1.30, 10.00, 10.00)
+
+    def test_zero_servings_is_reported(self):
+        with self.db.connect() as conn:
+            conn.execute("UPDATE recipes SET servings = 0 WHERE name = 'Hummus'")
+        with self.assertRaisesRegex(ValueError, 'no servings'):
+            self.db.calculate_recipe_cost('Hummus')
+
+
+class CostToCentsTest(unittest.TestCase):
+
+    def test_positive_costs_charge_at_least_a_cent(self):
+        self.assertEqual(_cost_to_cents(0.004), 1)
+        self.assertEqual(_cost_to_cents(1.234), 123)
+
+    def test_zero_and_negative_costs_are_not_raised(self):
+        self.assertEqual(_cost_to_cents(0.0), 0)
+        self.assertEqual(_cost_to_cents(-0.004), 0)
+
+
+class IngredientCostsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = make_database(self, ingredient_sql('Tahini', 0.25, recipe_unit='oz'))
+
+    def test_memoized_until_the_database_changes(self):
+        statements = []
+        self.db.set_trace_callback(statements.append)
+        self.addCleanup(self.db.set_trace_callback, None)
+        self.assertEqual(self.db.get_ingredient_costs(), {'Tahini': (0.25, 'oz')})
+        self.assertEqual(self.db.get_ingredient_costs(), {'Tahini': (0.25, 'oz')})
+        self.assertEqual(len([sql for sql in statements if 'cost_per_recipe_unit' in sql]), 1)
+
+        with self.db.connect() as conn:
+            conn.execute("UPDATE ingredients SET cost_per_recipe_unit = 0.5 WHERE name = 'Tahini'")
+        self.assertEqual(self.db.get_ingredient_costs(), {'Tahini': (0.5, 'oz')})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import contextlib
+import io
+import unittest
+
+from tests.support import ingredient_sql, make_database
+
+BASELINE_RECIPE_INGREDIENTS = """
+    CREATE TABLE recipe_ingredients (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        recipe_name TEXT NOT NULL,
+        ingredient_name TEXT NOT NULL,
+        quantity REAL NOT NULL,
+        unit TEXT NOT NULL,
+        UNIQUE(recipe_name, ingredient_name)
+    )
+"""
+
+
+class RecipeIngredientsWithoutRowidTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = make_database(self, (
+            ingredient_sql('Tahini', 1)
+            + ingredient_sql('Chickpeas', 1)
+            + "INSERT INTO recipes (name, servings) VALUES ('Hummus', 4);\n"
+            + "INSERT INTO recipe_ingredients (id, recipe_name, ingredient_name, quantity, unit) VALUES"
+            + " (7, 'Hummus', 'Tahini', 0.5, 'C'), (9, 'Hummus', 'Chickpeas', 2, 'lb');\n"
+        ))
+
+    def table_sql(self, conn):
+        return conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'recipe_ingredients'").fetchone()[0]
+
+    def test_baseline_database_is_migrated(self):
+        with self.db.connect() as conn:
+            self.assertIn('WITHOUT ROWID', self.table_sql(conn).upper())
+            columns = [col[1] for col in conn.execute("PRAGMA table_info(recipe_ingredients)")]
+            foreign_keys = {(fk[2], fk[3], fk[4]) for fk in conn.execute("PRAGMA foreign_key_list(recipe_ingredients)")}
+            rows = conn.execute("SELECT * FROM recipe_ingredients ORDER BY ingredient_name").fetchall()
+        # The surrogate id is gone; rows are keyed by (recipe_name, ingredient_name)
+        self.assertEqual(columns, ['recipe_name', 'ingredient_name', 'quantity', 'unit'])
+        self.assertEqual(foreign_keys, {('recipes', 'recipe_name', 'name'),
+                                        ('ingredients', 'ingredient_name', 'name')})
+        self.assertEqual(rows, [('Hummus', 'Chickpeas', 2.0, 'lb'), ('Hummus', 'Tahini', 0.5, 'C')])
+
+    def test_migration_joins_an_open_transaction(self):
+        with self.db.connect(immediate=True) as conn:
+            conn.execute("DROP TABLE recipe_ingredients")
+            conn.execute(BASELINE_RECIPE_INGREDIENTS)
+            conn.execute("INSERT INTO recipe_ingredients (recipe_name, ingredient_name, quantity, unit)"
+                         " VALUES ('Hummus', 'Tahini', 1, 'C')")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.db._migrate_recipe_ingredients_without_rowid(conn)
+            self.assertTrue(conn.in_transaction)
+        with self.db.connect() as conn:
+            self.assertIn('WITHOUT ROWID', self.table_sql(conn).upper())
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM recipe_ingredients").fetchone()[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from tests.support import flashes, make_client
+
+
+class DeletePlateCategoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client, self.db = make_client(self, (
+            "INSERT INTO plate_categories (id, name, display_order) VALUES (1, 'Mezze', 1), (2, 'Empty', 2);\n"
+            "INSERT INTO plates (name, category) VALUES ('Hummus Plate', 'Mezze');\n"
+        ))
+
+    def delete(self, category_id):
+        response = self.client.post('/plate_category/delete', data={'category_id': category_id})
+        self.assertEqual(response.status_code, 302)
+        return flashes(self.client)
+
+    def test_unused_category_is_deleted(self):
+        self.assertEqual(self.delete(2), [('success', "Category 'Empty' deleted successfully")])
+
+    def test_category_with_plates_is_kept(self):
+        self.assertEqual(self.delete(1), [('error', "Cannot delete 'Mezze' - it has 1 plate(s)")])
+
+    def test_unknown_category(self):
+        self.assertEqual(self.delete(99), [('error', "Category not found")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from tests.support import ingredient_sql, make_database
+
+
+class PlateCostPathsTest(unittest.TestCase):
+    """calculate_plate_cost and price_all_plates price every plate the same."""
+
+    def setUp(self):
+        self.db = make_database(self, (
+            ingredient_sql('Feta', 0.37, recipe_unit='oz')
+            + ingredient_sql('Olive Oil', 0.113, recipe_unit='tbsp')
+            + ingredient_sql('Oregano', 0.004, recipe_unit='tsp')
+            + ingredient_sql('Pita', 0.395, recipe_unit='ea')
+            + ingredient_sql('Tomato', 0.1, recipe_unit='ea')
+            + "INSERT INTO plates (name, category) VALUES"
+            + " ('Greek Salad', 'Salads'), ('Pita Basket', 'Mezze'), ('Empty Plate', 'Mezze');\n"
+            + "INSERT INTO plate_ingredients (plate_name, ingredient_name, quantity, unit) VALUES"
+            # Converted units, a sub-cent cost, an unconvertible unit and an unknown ingredient
+            + " ('Greek Salad', 'Feta', 0.25, 'lb'), ('Greek Salad', 'Olive Oil', 1.5, 'tbsp'),"
+            + " ('Greek Salad', 'Oregano', 0.5, 'tsp'), ('Greek Salad', 'Tomato', 3, 'ea'),"
+            + " ('Greek Salad', 'Pita', 1, 'handful'), ('Greek Salad', 'Capers', 1, 'tbsp'),"
+            + " ('Pita Basket', 'Pita', 3, 'ea'), ('Pita Basket', 'Olive Oil', 2, 'tsp'),"
+            + " ('Pita Basket', 'Tomato', 0.1, 'ea'), ('Pita Basket', 'Oregano', 1, 'tsp');\n"
+        ))
+
+    def test_both_paths_agree_for_every_plate(self):
+        totals = self.db.price_all_plates()
+        self.assertEqual(set(totals), {plate.name for plate in self.db.get_plates()})
+        for plate_name, total in totals.items():
+            with self.subTest(plate=plate_name):
+                self.assertEqual(self.db.calculate_plate_cost(plate_name)['total_cost'], total)
+
+    def test_breakdown_sums_to_the_ingredient_cost(self):
+        cost = self.db.calculate_plate_cost('Greek Salad')
+        self.assertEqual(sum(round(item['cost'] * 100) for item in cost['ingredient_breakdown']),
+                         round(cost['ingredient_cost'] * 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from tests.support import ingredient_sql, make_client
+
+
+class ScaleRecipePageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client, self.db = make_client(self, (
+            ingredient_sql('Lemon Juice', 0.2, recipe_unit='C')
+            + "INSERT INTO recipes (name, servings, instructions) VALUES"
+            + " ('Dressing', 4, 'Whisk 0.333 C lemon juice.');\n"
+            + "INSERT INTO recipe_ingredients (recipe_name, ingredient_name, quantity, unit)"
+            + " VALUES ('Dressing', 'Lemon Juice', 0.333, 'C');\n"
+        ))
+
+    def test_original_size_keeps_quantities_as_written(self):
+        page = self.client.get('/scale_recipe/Dressing?servings=4').get_data(as_text=True)
+        self.assertIn('<td class="fw-bold text-primary">0.333</td>', page)
+        self.assertIn('Whisk 0.333 C lemon juice.', page)
+        self.assertNotIn('-1.0%', page)
+
+    def test_other_sizes_are_scaled(self):
+        page = self.client.get('/scale_recipe/Dressing?servings=8').get_data(as_text=True)
+        self.assertIn('<td class="fw-bold text-primary">0.67</td>', page)
+
+
+if __name__ == '__main__':
+    unittest.main()
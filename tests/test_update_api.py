@@ -0,0 +1,94 @@
+import unittest
+
+from tests.support import ingredient_sql, make_client
+
+
+class SingleUpdateValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client, self.db = make_client(self, (
+            ingredient_sql('Tahini', 1, on_hand=2)
+            + "INSERT INTO recipes (name, servings, prepared_servings) VALUES ('Hummus', 4, 1);\n"
+            + "INSERT INTO recipe_ingredients (recipe_name, ingredient_name, quantity, unit)"
+            + " VALUES ('Hummus', 'Tahini', 1, 'ea');\n"
+        ))
+
+    def test_valid_values_are_stored(self):
+        response = self.client.post('/api/recipe/Hummus/update_prepared', json={'prepared_servings': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['prepared_servings'], 3)
+        response = self.client.post('/api/ingredient/Tahini/update_onhand', json={'on_hand': 0.5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['on_hand'], 0.5)
+
+    def test_invalid_values_are_rejected(self):
+        for url, field in (('/api/recipe/Hummus/update_prepared', 'prepared_servings'),
+                           ('/api/ingredient/Tahini/update_onhand', 'on_hand')):
+            for value in ('abc', '3', True, None, -1, [1]):
+                with self.subTest(url=url, value=value):
+                    response = self.client.post(url, json={field: value})
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.get_json(), {'error': f'Invalid {field} value'})
+
+    def test_non_finite_values_are_rejected(self):
+        # The stdlib parser accepts these literals
+        for body in ('{"on_hand": Infinity}', '{"on_hand": NaN}'):
+            with self.subTest(body=body):
+                response = self.client.post('/api/ingredient/Tahini/update_onhand', data=body,
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+
+    def test_missing_or_non_json_body_is_rejected(self):
+        for kwargs in ({}, {'data': 'not json', 'content_type': 'application/json'},
+                       {'json': [1, 2]}, {'data': {'on_hand': '3'}}):
+            with self.subTest(**{k: str(v) for k, v in kwargs.items()}):
+                response = self.client.post('/api/ingredient/Tahini/update_onhand', **kwargs)
+                self.assertEqual(response.status_code, 400)
+                response = self.client.post('/api/recipe/Hummus/update_prepared', **kwargs)
+                self.assertEqual(response.status_code, 400)
+
+    def test_scale_factor_must_be_a_positive_number(self):
+        for value in (0, -2, 'abc', True):
+            with self.subTest(value=value):
+                response = self.client.post('/api/recipes/Hummus/scale', json={'scale_factor': value})
+                self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/recipes/Hummus/scale', json={'scale_factor': 2})
+        self.assertEqual(response.status_code, 200)
+
+
+class BulkUpdateValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client, self.db = make_client(self, (
+            ingredient_sql('Tahini', 1, on_hand=2)
+            + "INSERT INTO recipes (name, servings, prepared_servings) VALUES ('Hummus', 4, 1);\n"
+        ))
+        self.tahini_id = self.db.get_ingredient('Tahini').id
+
+    def bulk_requests(self, value):
+        """One request per bulk endpoint, each setting a single row to value."""
+        return (
+            ('/api/bulk_update_stock', [{'id': self.tahini_id, 'quantity': value}]),
+            ('/api/ingredients/update_onhand_bulk', {'items': [{'name': 'Tahini', 'on_hand': value}]}),
+            ('/api/recipes/update_prepared_bulk', {'items': [{'name': 'Hummus', 'prepared_servings': value}]}),
+        )
+
+    def test_numbers_and_numeric_strings_are_stored(self):
+        for value in (4, 2.5, '3'):
+            for url, body in self.bulk_requests(value):
+                with self.subTest(url=url, value=value):
+                    response = self.client.post(url, json=body)
+                    self.assertEqual(response.get_json(), {'success': True, 'updated': 1})
+
+    def test_booleans_and_non_finite_values_are_rejected(self):
+        for value in (True, False, 'inf', '-inf', 'nan', 'Infinity', -1, 'abc', None):
+            for url, body in self.bulk_requests(value):
+                with self.subTest(url=url, value=value):
+                    response = self.client.post(url, json=body)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIs(response.get_json()['success'], False)
+        self.assertEqual(self.db.get_ingredient('Tahini').on_hand, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,2237 @@
+#!/usr/bin/env python3
+"""
+Modern Web-Based Recipe Management System
+A user-friendly Flask web application for managing recipes and ingredients
+"""
+
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, g, session, make_response
+from flask.json.provider import DefaultJSONProvider
+from pathlib import Path
+import functools
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+from rms_modern import DatabaseManager, Recipe, Ingredient, RecipeIngredient, Plate, PlateIngredient
+
+try:
+    import orjson
+except ImportError:  # optional: jsonify() falls back to the stdlib encoder
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Parse request bodies and serialize jsonify() responses with orjson.
+
+    tojson in templates keeps the stdlib encoder.
+    """
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+                  | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=option),
+                                        mimetype=self.mimetype)
+
+
+app = Flask(__name__)
+app.secret_key = 'rms_secret_key_2024'
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+logger = logging.getLogger(__name__)
+
+# Database setup
+DB_PATH = Path(__file__).parent / "rms_unified.db"
+db_manager = DatabaseManager(str(DB_PATH))
+
+def _request_ingredients():
+    """All ingredients, loaded at most once per request (kept on flask.g)."""
+    if 'ingredients' not in g:
+        g.ingredients = db_manager.get_ingredients()
+    return g.ingredients
+
+def _request_recipes():
+    """All recipes, loaded at most once per request (kept on flask.g)."""
+    if 'recipes' not in g:
+        g.recipes = db_manager.get_recipes()
+    return g.recipes
+
+# Distinguishes ETags issued by this process from those of an earlier run,
+# whose database versions started from the same numbers
+_ETAG_PREFIX = os.urandom(4).hex()
+
+def cached_response(max_age=0):
+    """Tag a read-only view's responses with a weak ETag of the database version.
+
+    A request whose If-None-Match still matches gets an empty 304 without
+    running the view. With max_age=0 browsers revalidate on every load, so an
+    edit is never hidden behind a stale page. Requests with flash messages
+    waiting are always rendered in full, so the messages are shown.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            etag = _ETAG_PREFIX + '-%d-%d' % db_manager.data_version()
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.cache_control.private = True
+            if max_age:
+                response.cache_control.max_age = max_age
+            else:
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+# JSON bodies below this size are sent as-is; gzip would barely shrink them
+_GZIP_MIN_SIZE = 500
+
+@app.after_request
+def compress_json(response):
+    """Gzip sizeable JSON responses for clients that accept it."""
+    if (response.status_code != 200 or response.mimetype != 'application/json'
+            or response.direct_passthrough or 'Content-Encoding' in response.headers):
+        return response
+
+    data = response.get_data()
+    if len(data) < _GZIP_MIN_SIZE:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if 'gzip' in request.accept_encodings:
+        response.set_data(gzip.compress(data, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@app.route('/')
+@cached_response()
+def dashboard():
+    """Main dashboard page."""
+    # Get some statistics
+    stats = db_manager.get_dashboard_stats()
+
+    # Recent recipes (last 5)
+    recent_recipes = db_manager.get_recipes(limit=5)
+
+    return render_template('dashboard.html', stats=stats, recent_recipes=recent_recipes)
+
+@app.route('/recipes')
+@cached_response()
+def recipes():
+    """Recipe listing page."""
+    all_recipes = _request_recipes()
+    return render_template('recipes.html', recipes=all_recipes)
+
+@app.route('/recipe/<path:recipe_name>')
+def recipe_detail(recipe_name):
+    """Recipe detail page."""
+    recipe = db_manager.get_recipe(recipe_name)
+
+    if not recipe:
+        flash(f"Recipe '{recipe_name}' not found", 'error')
+        return redirect(url_for('recipes'))
+
+    # Get recipe ingredients with on_hand quantities
+    recipe_ingredients = db_manager.get_recipe_ingredients_with_stock(recipe_name)
+
+    # Calculate cost
+    try:
+        cost_data = db_manager.calculate_recipe_cost(recipe_name)
+    except Exception as e:
+        cost_data = None
+        flash(f"Could not calculate cost: {str(e)}", 'warning')
+
+    # Get allergens
+    allergens = db_manager.get_recipe_allergens(recipe_name)
+    allergen_info = db_manager.get_allergen_infos()
+    allergen_details = [allergen_info[code] for code in sorted(allergens) if code in allergen_info]
+
+    return render_template('recipe_detail.html',
+                         recipe=recipe,
+                         recipe_ingredients=recipe_ingredients,
+                         cost_data=cost_data,
+                         allergens=allergen_details)
+
+@app.route('/ingredients')
+@cached_response()
+def ingredients():
+    """Ingredients listing page."""
+    search = request.args.get('search', '')
+    category = request.args.get('category', '')
+
+    if search or category:
+        all_ingredients = db_manager.search_ingredients(search, category)
+    else:
+        all_ingredients = _request_ingredients()
+
+    # Check which ingredients are used in recipes or plates
+    usage_map = db_manager.get_ingredient_usage_map()
+
+    # Add is_used attribute to ingredients
+    for ing in all_ingredients:
+        ing.is_used = usage_map.get(ing.name, 0)
+
+    # Get all categories for filter dropdown
+    all_categories = db_manager.get_categories()
+
+    return render_template('ingredients.html',
+                         ingredients=all_ingredients,
+                         categories=all_categories,
+                         current_search=search,
+                         current_category=category)
+
+@app.route('/ingredients/bulk')
+@cached_response()
+def ingredients_bulk():
+    """Bulk inventory management page."""
+    ingredients_by_category = db_manager.get_ingredients_by_category()
+    total_ingredients = sum(len(ingredients) for ingredients in ingredients_by_category.values())
+
+    # Check which ingredients are used in recipes or plates
+    usage_map = db_manager.get_ingredient_usage_map()
+
+    # Add is_used attribute to all ingredients
+    for category, ingredients in ingredients_by_category.items():
+        for ing in ingredients:
+            ing.is_used = usage_map.get(ing.name, 0)
+
+    return render_template('ingredients_bulk.html',
+                         ingredients_by_category=ingredients_by_category,
+                         total_ingredients=total_ingredients)
+
+@app.route('/api/update_ingredient_price', methods=['POST'])
+def api_update_ingredient_price():
+    """API endpoint to update ingredient purchase price (deprecated - use update_ingredient instead)."""
+    try:
+        ingredient_id = int(request.form['ingredient_id'])
+        purchase_price = float(request.form.get('purchase_price', request.form.get('bulk_price', 0)))
+
+        # Simple price update - recalculate all costs
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # Get current ingredient data
+            cursor.execute("""
+                SELECT units_per_purchase, recipe_units_per_inventory, yield_percent
+                FROM ingredients WHERE id = ?
+            """, (ingredient_id,))
+            result = cursor.fetchone()
+
+            if result:
+                units_per_purchase, recipe_units_per_inventory, yield_percent = result
+
+                # Recalculate costs
+                cost_per_inventory_unit = purchase_price / units_per_purchase if units_per_purchase > 0 else 0
+                cost_per_recipe_unit = (cost_per_inventory_unit / recipe_units_per_inventory) / (yield_percent / 100.0) if recipe_units_per_inventory > 0 else 0
+
+                # Update
+                cursor.execute("""
+                    UPDATE ingredients
+                    SET purchase_price = ?, cost_per_inventory_unit = ?, cost_per_recipe_unit = ?
+                    WHERE id = ?
+                """, (purchase_price, cost_per_inventory_unit, cost_per_recipe_unit, ingredient_id))
+
+                return jsonify({'success': True})
+            else:
+                return jsonify({'success': False, 'error': 'Ingredient not found'})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+class _MissingFormField(Exception):
+    """Raised by _parse_form for a required field that is absent or blank."""
+
+    def __init__(self, field):
+        super().__init__(field)
+        self.field = field
+
+
+def _parse_form(form, spec):
+    """Read (field, converter, required, default) entries from a form, in order.
+
+    A required field must be present and non-empty (after conversion, for
+    text fields); an optional one falls back to its default. Conversion
+    errors propagate as ValueError.
+    """
+    data = {}
+    for field, convert, required, default in spec:
+        raw = form.get(field) if required else form.get(field, default)
+        if required and not raw:
+            raise _MissingFormField(field)
+        value = convert(raw)
+        if required and value == '':
+            raise _MissingFormField(field)
+        data[field] = value
+    return data
+
+
+# Fields posted by the ingredient edit form, checked in this order
+_INGREDIENT_FORM = (
+    ('ingredient_id', int, True, None),
+    ('name', str.strip, True, None),
+    ('original_name', str.strip, False, ''),
+    ('category', str, True, None),
+    ('supplier', str, False, ''),
+    # Purchase level
+    ('purchase_unit', str, True, None),
+    ('purchase_price', float, True, None),
+    # Inventory level
+    ('inventory_unit', str, True, None),
+    ('units_per_purchase', float, True, None),
+    # Recipe level
+    ('recipe_unit', str, True, None),
+    ('recipe_units_per_inventory', float, True, None),
+    ('on_hand', float, False, '0'),
+    ('yield_percent', float, False, '95.0'),
+)
+
+@app.route('/api/update_ingredient', methods=['POST'])
+def api_update_ingredient():
+    """API endpoint to update all ingredient fields."""
+    try:
+        # Log what we received for debugging
+        logger.debug("Form data received: %s", request.form)
+
+        # Validate and convert fields in one pass
+        try:
+            form = _parse_form(request.form, _INGREDIENT_FORM)
+        except _MissingFormField as e:
+            field = 'ingredient name' if e.field == 'name' else e.field
+            return jsonify({'success': False, 'error': f'Missing {field}'}), 400
+
+        ingredient_id = form['ingredient_id']
+        new_name = form['name']
+        original_name = form['original_name']
+        category = form['category']
+        supplier = form['supplier']
+        purchase_unit = form['purchase_unit']
+        purchase_price = form['purchase_price']
+        inventory_unit = form['inventory_unit']
+        units_per_purchase = form['units_per_purchase']
+        recipe_unit = form['recipe_unit']
+        recipe_units_per_inventory = form['recipe_units_per_inventory']
+        on_hand = form['on_hand']
+        yield_percent = form['yield_percent']
+
+        # Get allergens from checkboxes (returns list)
+        allergens_list = request.form.getlist('allergens')
+        allergens_str = ','.join(allergens_list) if allergens_list else ''
+
+        logger.debug("Allergens received: %s -> %s", allergens_list, allergens_str)
+
+        # Calculate costs
+        cost_per_inventory_unit = purchase_price / units_per_purchase if units_per_purchase > 0 else 0
+        cost_per_recipe_unit = (cost_per_inventory_unit / recipe_units_per_inventory) / (yield_percent / 100.0) if recipe_units_per_inventory > 0 else 0
+
+        # One write transaction for the rename and the update, locked up front
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # If name changed, update all foreign key references first
+            if new_name != original_name and original_name:
+                # Update recipe_ingredients references
+                cursor.execute("""
+                    UPDATE recipe_ingredients
+                    SET ingredient_name = ?
+                    WHERE ingredient_name = ?
+                """, (new_name, original_name))
+
+                # Update plate_ingredients references
+                cursor.execute("""
+                    UPDATE plate_ingredients
+                    SET ingredient_name = ?
+                    WHERE ingredient_name = ?
+                """, (new_name, original_name))
+
+                logger.debug("Updated ingredient name from %r to %r", original_name, new_name)
+
+            # Update the ingredient itself
+            cursor.execute("""
+                UPDATE ingredients
+                SET name = ?, category = ?, supplier = ?,
+                    purchase_unit = ?, purchase_price = ?,
+                    inventory_unit = ?, units_per_purchase = ?, cost_per_inventory_unit = ?,
+                    recipe_unit = ?, recipe_units_per_inventory = ?, yield_percent = ?, cost_per_recipe_unit = ?,
+                    on_hand = ?, allergens = ?
+                WHERE id = ?
+            """, (new_name, category, supplier,
+                  purchase_unit, purchase_price,
+                  inventory_unit, units_per_purchase, cost_per_inventory_unit,
+                  recipe_unit, recipe_units_per_inventory, yield_percent, cost_per_recipe_unit,
+                  on_hand, allergens_str, ingredient_id))
+
+        return jsonify({'success': True, 'allergens': allergens_str, 'new_name': new_name})
+
+    except KeyError as e:
+        return jsonify({'success': False, 'error': f'Missing field: {str(e)}'}), 400
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid value: {str(e)}'}), 400
+    except Exception as e:
+        logger.exception("Error in update_ingredient")
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'}), 500
+
+@app.route('/api/update_ingredient_stock', methods=['POST'])
+def api_update_ingredient_stock():
+    """API endpoint to update ingredient stock quantity."""
+    try:
+        ingredient_id = int(request.form['ingredient_id'])
+        quantity = float(request.form['quantity'])
+
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE ingredients SET on_hand = ? WHERE id = ?",
+                         (quantity, ingredient_id))
+
+        return jsonify({'success': True})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def _is_amount(value):
+    """True for a finite, non-negative JSON number (booleans are not numbers here)."""
+    return (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value) and value >= 0)
+
+def _bulk_updates(items, key_field, key_type, value_field):
+    """Turn [{<key_field>, <value_field>}, ...] into (key, value) pairs; raises ValueError if malformed."""
+    if not isinstance(items, list):
+        raise ValueError(f'Expected a list of {{{key_field}, {value_field}}}')
+
+    updates = []
+    for item in items:
+        try:
+            key, value = key_type(item[key_field]), item[value_field]
+            # Numeric strings such as "3" are accepted; booleans are not numbers
+            if not isinstance(value, bool):
+                value = float(value)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f'Invalid update: {str(e)}')
+        if not _is_amount(value):
+            raise ValueError(f'{value_field} must be a finite, non-negative number')
+        updates.append((key, value))
+    return updates
+
+@app.route('/api/bulk_update_stock', methods=['POST'])
+def api_bulk_update_stock():
+    """API endpoint to update many stock quantities at once: [{id, quantity}, ...]."""
+    try:
+        updates = _bulk_updates(request.get_json(silent=True), 'id', int, 'quantity')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        updated = db_manager.update_ingredient_stock_bulk(updates)
+        return jsonify({'success': True, 'updated': updated})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/add_recipe', methods=['GET', 'POST'])
+def add_recipe():
+    """Add new recipe page."""
+    if request.method == 'POST':
+        try:
+            recipe = Recipe(
+                name=request.form['name'],
+                servings=int(request.form['servings']),
+                q_factor=float(request.form.get('q_factor', 0.04)),
+                description=request.form.get('description', ''),
+                prep_time=int(request.form.get('prep_time', 0)),
+                cook_time=int(request.form.get('cook_time', 0)),
+                instructions=request.form.get('instructions', ''),
+                whole_unit='whole_unit' in request.form
+            )
+
+            if db_manager.add_recipe(recipe):
+                flash(f"Recipe '{recipe.name}' added successfully!", 'success')
+                return redirect(url_for('recipe_detail', recipe_name=recipe.name))
+            else:
+                flash(f"Recipe '{recipe.name}' already exists!", 'error')
+
+        except Exception as e:
+            flash(f"Error adding recipe: {str(e)}", 'error')
+
+    return render_template('add_recipe.html')
+
+@app.route('/add_ingredient', methods=['GET', 'POST'])
+def add_ingredient():
+    """Add new ingredient page."""
+    if request.method == 'POST':
+        try:
+            # Get form data
+            name = request.form['name'].title()
+            category = request.form['category'].title()
+            supplier = request.form.get('supplier', '').strip()
+
+            # Purchase level
+            purchase_unit = request.form['purchase_unit']
+            purchase_price = float(request.form['purchase_price'])
+
+            # Inventory level
+            inventory_unit = request.form['inventory_unit']
+            units_per_purchase = float(request.form['units_per_purchase'])
+            on_hand = float(request.form.get('on_hand', 0))
+
+            # Recipe level
+            recipe_unit = request.form['recipe_unit']
+            recipe_units_per_inventory = float(request.form['recipe_units_per_inventory'])
+            yield_percent = float(request.form.get('yield_percent', 95.0))
+
+            # Calculate costs
+            cost_per_inventory_unit = purchase_price / units_per_purchase if units_per_purchase > 0 else 0
+            cost_per_recipe_unit = (cost_per_inventory_unit / recipe_units_per_inventory) / (yield_percent / 100.0) if recipe_units_per_inventory > 0 else 0
+
+            # Get allergens from checkboxes
+            allergens_list = request.form.getlist('allergens')
+            allergens_str = ','.join(allergens_list) if allergens_list else ''
+
+            # Insert into database
+            with db_manager.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO ingredients (
+                        name, category, purchase_unit, purchase_price,
+                        inventory_unit, units_per_purchase, cost_per_inventory_unit,
+                        on_hand, par_level,
+                        recipe_unit, recipe_units_per_inventory, yield_percent, cost_per_recipe_unit,
+                        supplier, allergens
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    name, category, purchase_unit, purchase_price,
+                    inventory_unit, units_per_purchase, cost_per_inventory_unit,
+                    on_hand, 0,  # par_level default
+                    recipe_unit, recipe_units_per_inventory, yield_percent, cost_per_recipe_unit,
+                    supplier, allergens_str
+                ))
+
+            flash(f"Ingredient '{name}' added successfully!", 'success')
+            return redirect(url_for('ingredients'))
+
+        except sqlite3.IntegrityError:
+            flash(f"Ingredient '{name}' already exists!", 'error')
+        except Exception as e:
+            flash(f"Error adding ingredient: {str(e)}", 'error')
+            logger.exception("Error adding ingredient")
+
+    # Get existing categories for dropdown
+    categories = db_manager.get_categories()
+
+    # Add default categories if none exist
+    if not categories:
+        categories = [
+            "Bar Supplies", "Bread", "Canned Goods", "Dairy and Eggs", "Dry Goods",
+            "Frozen", "Meats & Proteins", "Miscellaneous", "Nuts and Seeds",
+            "Oils and Vinegars", "Produce", "Readymade", "Spices and Seasonings"
+        ]
+
+    return render_template('add_ingredient.html', categories=categories)
+
+@app.route('/api/search_ingredients')
+@cached_response()
+def api_search_ingredients():
+    """API endpoint for ingredient search (includes both ingredients and recipes)."""
+    query = request.args.get('q', '').lower()
+
+    # Ingredients and recipes (sub-recipes/preparations) by name, limit 10
+    return jsonify(db_manager.autocomplete(query, limit=10))
+
+@app.route('/api/recipe_cost/<path:recipe_name>')
+@cached_response()
+def api_recipe_cost(recipe_name):
+    """API endpoint for recipe cost calculation."""
+    try:
+        cost_data = db_manager.calculate_recipe_cost(recipe_name)
+        return jsonify(cost_data)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+# action -> (SQL with named parameters, check that the action's values were
+# sent, error when they were not) for api_update_recipe_ingredient
+_RECIPE_INGREDIENT_ACTIONS = {
+    'add': ("""
+        INSERT INTO recipe_ingredients
+        (recipe_name, ingredient_name, quantity, unit)
+        VALUES (:recipe_name, :ingredient_name, :quantity, :unit)
+        ON CONFLICT (recipe_name, ingredient_name)
+        DO UPDATE SET quantity = excluded.quantity, unit = excluded.unit
+    """, lambda data: data.get('quantity') and data.get('unit'), 'Missing quantity or unit'),
+    'remove': ("""
+        DELETE FROM recipe_ingredients
+        WHERE recipe_name = :recipe_name AND ingredient_name = :ingredient_name
+    """, lambda data: True, None),
+    'update_quantity': ("""
+        UPDATE recipe_ingredients
+        SET quantity = :quantity
+        WHERE recipe_name = :recipe_name AND ingredient_name = :ingredient_name
+    """, lambda data: data.get('quantity') is not None, 'Missing quantity'),
+    'update_unit': ("""
+        UPDATE recipe_ingredients
+        SET unit = :unit
+        WHERE recipe_name = :recipe_name AND ingredient_name = :ingredient_name
+    """, lambda data: data.get('unit'), 'Missing unit'),
+}
+
+@app.route('/api/update_recipe_ingredient', methods=['POST'])
+def api_update_recipe_ingredient():
+    """API endpoint for updating recipe ingredients."""
+    try:
+        data = request.get_json()
+        recipe_name = data.get('recipe_name')
+        ingredient_name = data.get('ingredient_name')
+        action = data.get('action')
+
+        if not recipe_name or not ingredient_name or not action:
+            return jsonify({'success': False, 'error': 'Missing required fields'}), 400
+
+        entry = _RECIPE_INGREDIENT_ACTIONS.get(action) if isinstance(action, str) else None
+        if entry is None:
+            return jsonify({'success': False, 'error': 'Invalid action'}), 400
+
+        sql, has_values, missing_error = entry
+        if not has_values(data):
+            return jsonify({'success': False, 'error': missing_error}), 400
+
+        with db_manager.connect() as conn:
+            conn.execute(sql, {
+                'recipe_name': recipe_name,
+                'ingredient_name': ingredient_name,
+                'quantity': data.get('quantity'),
+                'unit': data.get('unit'),
+            })
+
+        return jsonify({'success': True})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/recipe/<path:recipe_name>/add_ingredient', methods=['GET', 'POST'])
+def add_ingredient_to_recipe(recipe_name):
+    """Add ingredient to recipe."""
+    if request.method == 'POST':
+        try:
+            recipe_ingredient = RecipeIngredient(
+                recipe_name=recipe_name,
+                ingredient_name=request.form['ingredient_name'],
+                quantity=float(request.form['quantity']),
+                unit=request.form['unit']
+            )
+
+            if db_manager.add_recipe_ingredient(recipe_ingredient):
+                flash(f"Added {recipe_ingredient.quantity} {recipe_ingredient.unit} of {recipe_ingredient.ingredient_name} to {recipe_name}", 'success')
+            else:
+                flash(f"Failed to add ingredient. It may already exist in this recipe.", 'error')
+
+            return redirect(url_for('recipe_detail', recipe_name=recipe_name))
+
+        except Exception as e:
+            flash(f"Error adding ingredient: {str(e)}", 'error')
+
+    return render_template('add_ingredient_to_recipe.html', recipe_name=recipe_name)
+
+@app.route('/recipe/<path:recipe_name>/edit', methods=['GET', 'POST'])
+def edit_recipe(recipe_name):
+    """Edit an existing recipe."""
+    recipe = db_manager.get_recipe(recipe_name)
+
+    if not recipe:
+        flash(f"Recipe '{recipe_name}' not found", 'error')
+        return redirect(url_for('recipes'))
+
+    if request.method == 'POST':
+        try:
+            updated_recipe = Recipe(
+                name=request.form['name'],
+                servings=int(request.form['servings']),
+                q_factor=float(request.form.get('q_factor', 0.04)),
+                description=request.form.get('description', ''),
+                prep_time=int(request.form.get('prep_time', 0)),
+                cook_time=int(request.form.get('cook_time', 0)),
+                instructions=request.form.get('instructions', ''),
+                whole_unit='whole_unit' in request.form
+            )
+
+            if db_manager.update_recipe(recipe_name, updated_recipe):
+                flash(f"Recipe '{updated_recipe.name}' updated successfully!", 'success')
+                return redirect(url_for('recipe_detail', recipe_name=updated_recipe.name))
+            else:
+                flash(f"Failed to update recipe. Name might already exist.", 'error')
+
+        except Exception as e:
+            flash(f"Error updating recipe: {str(e)}", 'error')
+
+    # Get recipe ingredients and all available ingredients
+    recipe_ingredients = db_manager.get_recipe_ingredients(recipe_name)
+    all_ingredients = _request_ingredients()
+
+    return render_template('edit_recipe.html',
+                         recipe=recipe,
+                         recipe_ingredients=recipe_ingredients,
+                         all_ingredients=all_ingredients)
+
+@app.route('/recipe/<path:recipe_name>/delete', methods=['POST'])
+def delete_recipe(recipe_name):
+    """Delete a recipe."""
+    try:
+        # Note: This is a simple implementation. In production, you'd want more sophisticated deletion
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+
+            # Delete recipe ingredients first (foreign key constraint)
+            cursor.execute("DELETE FROM recipe_ingredients WHERE recipe_name = ?", (recipe_name,))
+
+            # Delete the recipe
+            cursor.execute("DELETE FROM recipes WHERE name = ?", (recipe_name,))
+
+        flash(f"Recipe '{recipe_name}' has been deleted successfully.", 'success')
+        return redirect(url_for('recipes'))
+
+    except Exception as e:
+        flash(f"Error deleting recipe: {str(e)}", 'error')
+        return redirect(url_for('recipe_detail', recipe_name=recipe_name))
+
+# Units recognised in front of an ingredient name in recipe instructions.
+_QTY_UNITS = '|'.join([
+    # Volume
+    r'pinches?|pinch', r'dashes?|dash', r'teaspoons?|tsp|t', r'tablespoons?|tbsp|T',
+    r'fl\.?oz\.?|fluid\s+ounces?', r'cups?|cup|c', r'pints?|pt', r'quarts?|qt',
+    r'gallons?|gal',
+    # Weight
+    r'ounces?|oz', r'pounds?|lbs?|lb', r'grams?|g', r'kilograms?|kg',
+    # Count
+    r'cloves?', r'bunches?|bunch', r'slices?|slice', r'loaves?|loaf', r'dozens?|doz',
+])
+
+# One alternation over every unit, plus the bare "6 apples" form, so the
+# instructions are scanned once instead of once per unit.
+_QTY_PATTERN = re.compile(
+    r'(?P<qty>\d+\/\d+|\d+(?:\.\d+)?)'
+    r'(?:\s*(?P<unit>' + _QTY_UNITS + r')\s+(?:of\s+)?(?P<ingredient>\w+)'
+    r'|\s+(?P<bare>\w+)(?=\s|,|\.|\n|$))',
+    re.IGNORECASE
+)
+
+
+# Values of the quantities recipes use most: kitchen fractions and 1-12
+_COMMON_QUANTITIES = {f"{num}/{den}": num / den for den in (2, 3, 4, 8) for num in range(1, den)}
+_COMMON_QUANTITIES.update((str(n), float(n)) for n in range(1, 13))
+
+
+def _parse_quantity(text):
+    """Convert a quantity like "3/4" or "1.5" to a float."""
+    value = _COMMON_QUANTITIES.get(text)
+    if value is None:
+        # Convert fraction to decimal if needed
+        num, _, den = text.partition('/')
+        value = float(num) / float(den) if den else float(num)
+    return value
+
+
+@functools.lru_cache(maxsize=256)
+def _format_quantity(qty):
+    """Format a scaled quantity nicely: whole numbers bare, others to at most 2 decimals."""
+    if qty == int(qty):
+        return str(int(qty))
+    return f"{qty:.2f}".rstrip('0').rstrip('.')
+
+
+@functools.lru_cache(maxsize=128)
+def _ingredient_spellings(names):
+    """Map every spelling an instruction may use for one of names to that name.
+
+    Plurals are matched by adding or removing s/es. Earlier names win a
+    shared spelling; an exact name always wins. The result is shared
+    between calls with the same names and must not be modified.
+    """
+    spellings = {}
+    for name in names:
+        for variant in (name + 's', name + 'es'):
+            spellings.setdefault(variant, name)
+        for suffix in ('s', 'es'):
+            if name.endswith(suffix):
+                spellings.setdefault(name[:-len(suffix)], name)
+    spellings.update((name, name) for name in names)
+    return spellings
+
+
+def scale_instructions(original_instructions, scaled_ingredients, scale_factor):
+    """Scale ingredient quantities mentioned in recipe instructions."""
+    if not original_instructions:
+        return ""
+
+    # Nothing to scale at the original size; keep the text exactly as written
+    if scale_factor == 1:
+        return original_instructions
+
+    # Lowercased recipe ingredient names in recipe order, and their spellings
+    ingredient_names = tuple(dict.fromkeys(ing['name'].lower() for ing in scaled_ingredients))
+    ingredient_lookup = _ingredient_spellings(ingredient_names)
+
+    def scale_match(match):
+        original_qty_str = match.group('qty')
+        ingredient_lower = (match.group('ingredient') or match.group('bare')).lower()
+
+        # Check if this ingredient is in our recipe (handle plurals and case)
+        matched_ingredient = ingredient_lookup.get(ingredient_lower)
+
+        if not matched_ingredient:
+            return match.group(0)
+
+        try:
+            original_qty = _parse_quantity(original_qty_str)
+        except (ValueError, ZeroDivisionError):
+            return match.group(0)
+
+        # Scale the quantity
+        scaled_qty_str = _format_quantity(original_qty * scale_factor)
+
+        # Only the number changes; unit and ingredient text keep their case
+        return scaled_qty_str + match.group(0)[len(original_qty_str):]
+
+    return _QTY_PATTERN.sub(scale_match, original_instructions)
+
+@app.route('/scale_recipe/<path:recipe_name>')
+def scale_recipe(recipe_name):
+    """Recipe scaling page."""
+    servings = request.args.get('servings', type=int)
+
+    if not servings:
+        flash("Please specify number of servings", 'error')
+        return redirect(url_for('recipe_detail', recipe_name=recipe_name))
+
+    try:
+        # Get original recipe data
+        recipe = db_manager.get_recipe(recipe_name)
+
+        if not recipe:
+            flash(f"Recipe '{recipe_name}' not found", 'error')
+            return redirect(url_for('recipes'))
+
+        cost_data = db_manager.calculate_recipe_cost(recipe_name)
+
+        # Handle whole unit recipes differently
+        if recipe.whole_unit:
+            # Calculate how many whole units (pies, cakes, etc.) are needed
+            units_needed = (servings + cost_data['servings'] - 1) // cost_data['servings']  # Ceiling division
+            actual_servings = units_needed * cost_data['servings']
+            scale_factor = units_needed
+
+            # Scale ingredients, then apply prep factor to scaled amount
+            scaled_ingredient_cost = cost_data['ingredient_cost'] * scale_factor
+            scaled_prep_cost = scaled_ingredient_cost * cost_data['prep_factor']
+            scaled_total = scaled_ingredient_cost + scaled_prep_cost
+
+            scaled_data = {
+                'original_servings': cost_data['servings'],
+                'new_servings': servings,
+                'actual_servings': actual_servings,
+                'units_needed': units_needed,
+                'is_whole_unit': True,
+                'scale_factor': scale_factor,
+                'original_cost': cost_data['total_cost'],
+                'scaled_ingredient_cost': round(scaled_ingredient_cost, 2),
+                'prep_factor': cost_data['prep_factor'],
+                'prep_factor_cost': round(scaled_prep_cost, 2),
+                'scaled_cost': round(scaled_total, 2),
+                'cost_per_serving': round(scaled_total / actual_servings, 2),
+                'waste_servings': actual_servings - servings,
+                'scaled_ingredients': []
+            }
+        else:
+            # Normal scaling for recipes that can be smoothly scaled
+            scale_factor = servings / cost_data['servings']
+
+            # Scale ingredients, then apply prep factor to scaled amount
+            scaled_ingredient_cost = cost_data['ingredient_cost'] * scale_factor
+            scaled_prep_cost = scaled_ingredient_cost * cost_data['prep_factor']
+            scaled_total = scaled_ingredient_cost + scaled_prep_cost
+
+            scaled_data = {
+                'original_servings': cost_data['servings'],
+                'new_servings': servings,
+                'is_whole_unit': False,
+                'scale_factor': scale_factor,
+                'original_cost': cost_data['total_cost'],
+                'scaled_ingredient_cost': round(scaled_ingredient_cost, 2),
+                'prep_factor': cost_data['prep_factor'],
+                'prep_factor_cost': round(scaled_prep_cost, 2),
+                'scaled_cost': round(scaled_total, 2),
+                'cost_per_serving': round(scaled_total / servings, 2),
+                'scaled_ingredients': []
+            }
+
+        # Scale ingredients; at the original size the quantities are shown as
+        # written, like scale_instructions does for the text, so 0.333 does
+        # not turn into 0.33 and a -1% change
+        recipe_ingredients = db_manager.get_recipe_ingredients(recipe_name)
+        for ing in recipe_ingredients:
+            scaled_quantity = ing.quantity if scale_factor == 1 else round(ing.quantity * scale_factor, 2)
+            scaled_data['scaled_ingredients'].append({
+                'name': ing.ingredient_name,
+                'original_quantity': ing.quantity,
+                'scaled_quantity': scaled_quantity,
+                'unit': ing.unit
+            })
+
+        # Scale instructions
+        scaled_data['original_instructions'] = recipe.instructions
+        scaled_data['scaled_instructions'] = scale_instructions(
+            recipe.instructions,
+            scaled_data['scaled_ingredients'],
+            scale_factor
+        )
+
+        return render_template('scale_recipe.html',
+                             recipe_name=recipe_name,
+                             recipe=recipe,
+                             scaled_data=scaled_data,
+                             cost_data=cost_data)
+
+    except Exception as e:
+        flash(f"Error scaling recipe: {str(e)}", 'error')
+        return redirect(url_for('recipe_detail', recipe_name=recipe_name))
+
+# PLATE/MENU MANAGEMENT ROUTES
+
+@app.route('/plates')
+def plates():
+    """Show all plates/menu items."""
+    with db_manager.connect() as conn:
+        cursor = conn.cursor()
+
+        # Get active plates in menu order: categories as ordered in
+        # plate_categories (unlisted ones last, by their first plate), then
+        # display_order within each category
+        cursor.execute("""
+            SELECT p.name, p.category, p.description, p.display_order
+            FROM plates p
+            LEFT JOIN plate_categories c ON c.name = p.category
+            WHERE p.is_active = 1
+            ORDER BY c.display_order IS NULL, c.display_order, c.id, p.display_order, p.id
+        """)
+
+        plates_data = cursor.fetchall()
+
+        # Get category order
+        cursor.execute("""
+            SELECT name FROM plate_categories
+            ORDER BY display_order
+        """)
+        menu_order = [row[0] for row in cursor.fetchall()]
+
+    # Group plates by category (already in menu order) and add allergens
+    allergen_info = db_manager.get_allergen_infos()
+    plate_allergens = db_manager.get_all_plate_allergens()
+    ordered_categories = {}
+    for plate_row in plates_data:
+        plate_name = plate_row[0]
+        # Get allergens for this plate
+        allergens = plate_allergens.get(plate_name, ())
+        allergen_icons = [allergen_info[code]['icon'] for code in sorted(allergens) if code in allergen_info]
+
+        plate_dict = {
+            'name': plate_name,
+            'category': plate_row[1],
+            'description': plate_row[2],
+            'display_order': plate_row[3],
+            'allergens': ' '.join(allergen_icons) if allergen_icons else ''
+        }
+        ordered_categories.setdefault(plate_row[1], []).append(plate_dict)
+
+    # Get all available categories for the Add Plate modal
+    all_categories = menu_order
+
+    return render_template('plates.html',
+                         categories=ordered_categories,
+                         all_categories=all_categories)
+
+@app.route('/plate/<path:plate_name>')
+def plate_detail(plate_name):
+    """Show detailed plate information with cost calculation."""
+    try:
+
+        # Get plate info including q_factor, and the recipes attached to it
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.name, p.category, p.description, p.q_factor,
+                       pr.recipe_name, pr.servings, pr.quantity, pr.unit
+                FROM plates p
+                LEFT JOIN plate_recipes pr ON pr.plate_name = p.name
+                WHERE p.name = ?
+                ORDER BY pr.recipe_name
+            """, (plate_name,))
+            rows = cursor.fetchall()
+
+        if not rows:
+            flash(f"Plate '{plate_name}' not found", 'error')
+            return redirect(url_for('plates'))
+
+        row = rows[0]
+        plate = {
+            'name': row[0],
+            'category': row[1],
+            'description': row[2],
+            'q_factor': row[3] if row[3] is not None else 0.04
+        }
+
+        plate_ingredients = db_manager.get_plate_ingredients(plate_name)
+
+        # Cost the recipes attached to this plate (none if the LEFT JOIN found none)
+        attached = [row[4:] for row in rows if row[4] is not None]
+        recipe_costs = db_manager.calculate_recipe_costs([row[0] for row in attached])
+        plate_recipes = []
+        total_recipe_cost = 0.0
+        for recipe_name, servings, quantity, unit in attached:
+            # Get recipe details and calculate cost
+            recipe_cost_data = recipe_costs[recipe_name]
+            if recipe_cost_data:
+                # Use quantity/unit if specified, otherwise fall back to servings
+                if quantity and unit:
+                    # Calculate cost based on quantity
+                    # If unit is 'servings', multiply cost_per_serving by quantity
+                    # For other units, we'd need yield/conversion info (future enhancement)
+                    if unit.lower() in ['servings', 'serving']:
+                        recipe_total = recipe_cost_data['cost_per_serving'] * quantity
+                    else:
+                        # For non-serving units, use quantity as-is (may need conversion logic later)
+                        recipe_total = recipe_cost_data['cost_per_serving'] * quantity
+                    plate_recipes.append({
+                        'name': recipe_name,
+                        'quantity': quantity,
+                        'unit': unit,
+                        'servings': servings,
+                        'cost_per_serving': recipe_cost_data['cost_per_serving'],
+                        'total_cost': recipe_total
+                    })
+                else:
+                    recipe_total = recipe_cost_data['cost_per_serving'] * servings
+                    plate_recipes.append({
+                        'name': recipe_name,
+                        'servings': servings,
+                        'quantity': None,
+                        'unit': None,
+                        'cost_per_serving': recipe_cost_data['cost_per_serving'],
+                        'total_cost': recipe_total
+                    })
+                total_recipe_cost += recipe_total
+
+        # Calculate direct ingredient costs
+        ingredient_cost_data = db_manager.calculate_plate_cost(plate_name)
+        direct_ingredient_cost = ingredient_cost_data['ingredient_cost'] if ingredient_cost_data else 0.0
+
+        # NEW CALCULATION: Recipe costs + Direct ingredient costs, THEN apply Q-factor
+        subtotal = total_recipe_cost + direct_ingredient_cost
+        q_factor_cost = subtotal * plate['q_factor']
+        total_cost = subtotal + q_factor_cost
+
+        # Build corrected cost_data
+        cost_data = {
+            'recipe_cost': total_recipe_cost,
+            'ingredient_cost': direct_ingredient_cost,
+            'subtotal': subtotal,
+            'q_factor': plate['q_factor'],
+            'q_factor_cost': q_factor_cost,
+            'total_cost': total_cost,
+            'ingredient_breakdown': ingredient_cost_data['ingredient_breakdown'] if ingredient_cost_data else []
+        }
+
+        # Get allergens for the plate
+        allergens = db_manager.get_plate_allergens(plate_name)
+        allergen_info = db_manager.get_allergen_infos()
+        allergen_details = [allergen_info[code] for code in sorted(allergens) if code in allergen_info]
+
+        return render_template('plate_detail.html',
+                             plate=plate,
+                             plate_ingredients=plate_ingredients,
+                             plate_recipes=plate_recipes,
+                             cost_data=cost_data,
+                             allergens=allergen_details)
+
+    except Exception as e:
+        flash(f"Error loading plate: {str(e)}", 'error')
+        return redirect(url_for('plates'))
+
+@app.route('/plate/<path:plate_name>/add_ingredient', methods=['GET', 'POST'])
+def add_ingredient_to_plate(plate_name):
+    """Add ingredient to plate."""
+    if request.method == 'POST':
+        try:
+            plate_ingredient = PlateIngredient(
+                plate_name=plate_name,
+                ingredient_name=request.form['ingredient_name'],
+                quantity=float(request.form['quantity']),
+                unit=request.form['unit']
+            )
+
+            if db_manager.add_plate_ingredient(plate_ingredient):
+                flash(f"Ingredient added to {plate_name}", 'success')
+            else:
+                flash("Failed to add ingredient to plate", 'error')
+
+        except ValueError:
+            flash("Invalid quantity value", 'error')
+        except Exception as e:
+            flash(f"Error: {str(e)}", 'error')
+
+        return redirect(url_for('plate_detail', plate_name=plate_name))
+
+    # GET request - show form
+    ingredients = db_manager.get_ingredients()
+    recipes_raw = db_manager.get_recipes()
+
+    # Group ingredients by category
+    ingredients_by_category = {}
+    for ing in ingredients:
+        if ing.category not in ingredients_by_category:
+            ingredients_by_category[ing.category] = []
+        ingredients_by_category[ing.category].append(ing)
+
+    # The recipe dropdown only shows names and default servings; costs are
+    # available from /api/recipe_cost/<name> if the form ever needs them
+    recipes = [
+        {'name': recipe.name, 'servings': recipe.servings, 'description': recipe.description}
+        for recipe in recipes_raw
+    ]
+
+    return render_template('add_ingredient_to_plate.html',
+                         plate_name=plate_name,
+                         ingredients_by_category=ingredients_by_category,
+                         recipes=recipes)
+
+@app.route('/plate/<path:plate_name>/add_recipe', methods=['POST'])
+def add_recipe_to_plate(plate_name):
+    """Add recipe to plate."""
+    try:
+        recipe_name = request.form['recipe_name']
+        servings = float(request.form.get('servings', 1.0))
+        quantity = request.form.get('quantity')
+        unit = request.form.get('unit')
+
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+
+            # Convert quantity to float if provided
+            if quantity:
+                quantity = float(quantity)
+
+            cursor.execute("""
+                INSERT INTO plate_recipes (plate_name, recipe_name, servings, quantity, unit)
+                VALUES (?, ?, ?, ?, ?)
+            """, (plate_name, recipe_name, servings, quantity, unit))
+
+        flash(f"Preparation '{recipe_name}' added to {plate_name}", 'success')
+
+    except sqlite3.IntegrityError:
+        flash(f"Preparation '{recipe_name}' is already in this plate", 'error')
+    except ValueError:
+        flash("Invalid quantity or servings value", 'error')
+    except Exception as e:
+        flash(f"Error: {str(e)}", 'error')
+
+    return redirect(url_for('plate_detail', plate_name=plate_name))
+
+@app.route('/plate/<path:plate_name>/delete_ingredient/<path:ingredient_name>', methods=['POST'])
+def delete_ingredient_from_plate(plate_name, ingredient_name):
+    """Delete ingredient from plate."""
+    try:
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM plate_ingredients
+                WHERE plate_name = ? AND ingredient_name = ?
+            """, (plate_name, ingredient_name))
+
+        flash(f"Ingredient '{ingredient_name}' removed from {plate_name}", 'success')
+
+    except Exception as e:
+        flash(f"Error: {str(e)}", 'error')
+
+    return redirect(url_for('plate_detail', plate_name=plate_name))
+
+@app.route('/plate/<path:plate_name>/delete_recipe/<path:recipe_name>', methods=['POST'])
+def delete_recipe_from_plate(plate_name, recipe_name):
+    """Delete recipe from plate."""
+    try:
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM plate_recipes
+                WHERE plate_name = ? AND recipe_name = ?
+            """, (plate_name, recipe_name))
+
+        flash(f"Recipe '{recipe_name}' removed from {plate_name}", 'success')
+
+    except Exception as e:
+        flash(f"Error: {str(e)}", 'error')
+
+    return redirect(url_for('plate_detail', plate_name=plate_name))
+
+@app.route('/plate/<path:plate_name>/update_ingredient/<path:ingredient_name>', methods=['POST'])
+def update_plate_ingredient(plate_name, ingredient_name):
+    """Update ingredient quantity/unit in plate."""
+    try:
+        quantity = float(request.form['quantity'])
+        unit = request.form['unit']
+
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE plate_ingredients
+                SET quantity = ?, unit = ?
+                WHERE plate_name = ? AND ingredient_name = ?
+            """, (quantity, unit, plate_name, ingredient_name))
+
+        flash(f"Ingredient '{ingredient_name}' updated", 'success')
+
+    except ValueError:
+        flash("Invalid quantity value", 'error')
+    except Exception as e:
+        flash(f"Error: {str(e)}", 'error')
+
+    return redirect(url_for('plate_detail', plate_name=plate_name))
+
+@app.route('/plate/<path:plate_name>/update_recipe/<path:recipe_name>', methods=['POST'])
+def update_plate_recipe(plate_name, recipe_name):
+    """Update recipe quantity/unit/servings in plate."""
+    try:
+        quantity = request.form.get('quantity')
+        unit = request.form.get('unit')
+        servings = float(request.form.get('servings', 1.0))
+
+        # Convert quantity to float if provided
+        if quantity:
+            quantity = float(quantity)
+
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE plate_recipes
+                SET quantity = ?, unit = ?, servings = ?
+                WHERE plate_name = ? AND recipe_name = ?
+            """, (quantity, unit, servings, plate_name, recipe_name))
+
+        flash(f"Preparation '{recipe_name}' updated", 'success')
+
+    except ValueError:
+        flash("Invalid quantity or servings value", 'error')
+    except Exception as e:
+        flash(f"Error: {str(e)}", 'error')
+
+    return redirect(url_for('plate_detail', plate_name=plate_name))
+
+@app.route('/plate/<path:plate_name>/update_qfactor', methods=['POST'])
+def update_plate_qfactor(plate_name):
+    """Update Q-factor for a plate."""
+    try:
+        q_factor = float(request.form['q_factor'])
+
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE plates
+                SET q_factor = ?
+                WHERE name = ?
+            """, (q_factor, plate_name))
+
+        flash(f"Q-Factor updated to {q_factor * 100:.1f}%", 'success')
+
+    except ValueError:
+        flash("Invalid Q-Factor value", 'error')
+    except Exception as e:
+        flash(f"Error: {str(e)}", 'error')
+
+    return redirect(url_for('plate_detail', plate_name=plate_name))
+
+@app.route('/recipe/<path:recipe_name>/update_prepfactor', methods=['POST'])
+def update_recipe_prepfactor(recipe_name):
+    """Update prep_factor for a recipe."""
+    try:
+        prep_factor = float(request.form['prep_factor'])
+
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE recipes
+                SET prep_factor = ?
+                WHERE name = ?
+            """, (prep_factor, recipe_name))
+
+        flash(f"Prep Factor updated to {prep_factor * 100:.1f}%", 'success')
+
+    except ValueError:
+        flash("Invalid Prep Factor value", 'error')
+    except Exception as e:
+        flash(f"Error: {str(e)}", 'error')
+
+    return redirect(url_for('recipe_detail', recipe_name=recipe_name))
+
+# =============================================================================
+# PLATE CATEGORY MANAGEMENT
+# =============================================================================
+
+@app.route('/plate_categories')
+@cached_response()
+def plate_categories():
+    """Manage plate categories."""
+    categories = db_manager.get_plate_categories()
+    return render_template('plate_categories.html', categories=categories)
+
+@app.route('/plate_category/add', methods=['POST'])
+def add_plate_category():
+    """Add a new plate category."""
+    try:
+        category_name = request.form['category_name'].strip()
+
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # Append after the current last category
+            cursor.execute("""
+                INSERT INTO plate_categories (name, display_order)
+                VALUES (?, COALESCE((SELECT MAX(display_order) FROM plate_categories), 0) + 1)
+            """, (category_name,))
+
+        flash(f"Category '{category_name}' added successfully", 'success')
+
+    except sqlite3.IntegrityError:
+        flash(f"Category '{category_name}' already exists", 'error')
+    except Exception as e:
+        flash(f"Error adding category: {str(e)}", 'error')
+
+    return redirect(url_for('plate_categories'))
+
+@app.route('/plate_category/edit', methods=['POST'])
+def edit_plate_category():
+    """Rename a plate category."""
+    try:
+        category_id = int(request.form['category_id'])
+        new_name = request.form['new_name'].strip()
+
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # Get old name
+            cursor.execute("SELECT name FROM plate_categories WHERE id = ?", (category_id,))
+            old_name = cursor.fetchone()[0]
+
+            # Update category table
+            cursor.execute("""
+                UPDATE plate_categories
+                SET name = ?
+                WHERE id = ?
+            """, (new_name, category_id))
+
+            # Update all plates using this category
+            cursor.execute("""
+                UPDATE plates
+                SET category = ?
+                WHERE category = ?
+            """, (new_name, old_name))
+
+        flash(f"Category renamed from '{old_name}' to '{new_name}'", 'success')
+
+    except sqlite3.IntegrityError:
+        flash(f"Category '{new_name}' already exists", 'error')
+    except Exception as e:
+        flash(f"Error renaming category: {str(e)}", 'error')
+
+    return redirect(url_for('plate_categories'))
+
+@app.route('/plate_category/delete', methods=['POST'])
+def delete_plate_category():
+    """Delete a plate category (only if no plates use it)."""
+    try:
+        category_id = int(request.form['category_id'])
+
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # Delete only if no plates use this category
+            cursor.execute("""
+                DELETE FROM plate_categories
+                WHERE id = ?
+                  AND NOT EXISTS (SELECT 1 FROM plates WHERE category = plate_categories.name)
+                RETURNING name
+            """, (category_id,))
+            deleted = cursor.fetchone()
+
+            blocked = None
+            if not deleted:
+                cursor.execute("""
+                    SELECT name, (SELECT COUNT(*) FROM plates WHERE category = pc.name)
+                    FROM plate_categories pc
+                    WHERE id = ?
+                """, (category_id,))
+                blocked = cursor.fetchone()
+
+        if deleted:
+            flash(f"Category '{deleted[0]}' deleted successfully", 'success')
+        elif blocked:
+            category_name, plate_count = blocked
+            flash(f"Cannot delete '{category_name}' - it has {plate_count} plate(s)", 'error')
+        else:
+            flash("Category not found", 'error')
+
+    except Exception as e:
+        flash(f"Error deleting category: {str(e)}", 'error')
+
+    return redirect(url_for('plate_categories'))
+
+@app.route('/plate_category/move', methods=['POST'])
+def move_plate_category():
+    """Move a category up or down in display order."""
+    try:
+        category_id = int(request.form['category_id'])
+        direction = request.form['direction']
+
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # Get current category
+            cursor.execute("""
+                SELECT id, display_order
+                FROM plate_categories
+                WHERE id = ?
+            """, (category_id,))
+            current = cursor.fetchone()
+            current_order = current[1]
+
+            if direction == 'up':
+                # Swap with previous
+                cursor.execute("""
+                    SELECT id, display_order
+                    FROM plate_categories
+                    WHERE display_order < ?
+                    ORDER BY display_order DESC
+                    LIMIT 1
+                """, (current_order,))
+            else:  # down
+                # Swap with next
+                cursor.execute("""
+                    SELECT id, display_order
+                    FROM plate_categories
+                    WHERE display_order > ?
+                    ORDER BY display_order ASC
+                    LIMIT 1
+                """, (current_order,))
+
+            swap_row = cursor.fetchone()
+            if swap_row:
+                swap_id, swap_order = swap_row
+
+                # Swap orders
+                cursor.execute("""
+                    UPDATE plate_categories
+                    SET display_order = CASE id WHEN ? THEN ? WHEN ? THEN ? END
+                    WHERE id IN (?, ?)
+                """, (category_id, swap_order, swap_id, current_order, category_id, swap_id))
+
+        if swap_row:
+            flash("Category order updated", 'success')
+
+    except Exception as e:
+        flash(f"Error moving category: {str(e)}", 'error')
+
+    return redirect(url_for('plate_categories'))
+
+@app.route('/plate_category/reorder', methods=['POST'])
+def reorder_plate_categories():
+    """Set many category display orders at once: [{id, display_order}, ...]."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return jsonify({'success': False, 'error': 'Expected a list of {id, display_order}'}), 400
+
+    try:
+        orders = [(int(item['display_order']), int(item['id'])) for item in data]
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Invalid order: {str(e)}'}), 400
+
+    try:
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("UPDATE plate_categories SET display_order = ? WHERE id = ?", orders)
+        return jsonify({'success': True, 'updated': cursor.rowcount})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/plate/add', methods=['POST'])
+def add_plate():
+    """Add a new plate."""
+    try:
+        plate_name = request.form['plate_name'].strip()
+        category = request.form['category']
+        description = request.form.get('description', '').strip()
+
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # Append after the last plate in this category
+            cursor.execute("""
+                INSERT INTO plates (name, category, description, display_order, is_active)
+                VALUES (?, ?, ?, COALESCE((SELECT MAX(display_order) FROM plates WHERE category = ?), 0) + 1, 1)
+            """, (plate_name, category, description, category))
+
+        flash(f"Plate '{plate_name}' added successfully", 'success')
+
+    except sqlite3.IntegrityError:
+        flash(f"Plate '{plate_name}' already exists", 'error')
+    except Exception as e:
+        flash(f"Error adding plate: {str(e)}", 'error')
+
+    return redirect(url_for('plates'))
+
+@app.route('/plate/move', methods=['POST'])
+def move_plate():
+    """Move a plate up or down within its category."""
+    try:
+        plate_name = request.form['plate_name']
+        category = request.form['category']
+        direction = request.form['direction']
+
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+
+            # Get current plate
+            cursor.execute("""
+                SELECT name, display_order
+                FROM plates
+                WHERE name = ? AND category = ?
+            """, (plate_name, category))
+            current = cursor.fetchone()
+            current_order = current[1]
+
+            if direction == 'up':
+                # Swap with previous in same category
+                cursor.execute("""
+                    SELECT name, display_order
+                    FROM plates
+                    WHERE category = ? AND display_order < ? AND is_active = 1
+                    ORDER BY display_order DESC
+                    LIMIT 1
+                """, (category, current_order))
+            else:  # down
+                # Swap with next in same category
+                cursor.execute("""
+                    SELECT name, display_order
+                    FROM plates
+                    WHERE category = ? AND display_order > ? AND is_active = 1
+                    ORDER BY display_order ASC
+                    LIMIT 1
+                """, (category, current_order))
+
+            swap_row = cursor.fetchone()
+            if swap_row:
+                swap_name, swap_order = swap_row
+
+                # Swap orders
+                cursor.execute("""
+                    UPDATE plates
+                    SET display_order = CASE name WHEN ? THEN ? WHEN ? THEN ? END
+                    WHERE name IN (?, ?)
+                """, (plate_name, swap_order, swap_name, current_order, plate_name, swap_name))
+
+    except Exception as e:
+        flash(f"Error moving plate: {str(e)}", 'error')
+
+    return redirect(url_for('plates'))
+
+@app.route('/plate/reorder', methods=['POST'])
+def reorder_plates():
+    """Set many plate display orders at once: [{name, display_order}, ...]."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return jsonify({'success': False, 'error': 'Expected a list of {name, display_order}'}), 400
+
+    try:
+        orders = [(int(item['display_order']), str(item['name'])) for item in data]
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Invalid order: {str(e)}'}), 400
+
+    try:
+        with db_manager.connect(immediate=True) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("UPDATE plates SET display_order = ? WHERE name = ?", orders)
+        return jsonify({'success': True, 'updated': cursor.rowcount})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/plate/archive', methods=['POST'])
+def archive_plate():
+    """Archive a plate (hide from menu but don't delete)."""
+    try:
+        plate_name = request.form['plate_name']
+
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE plates
+                SET is_active = 0
+                WHERE name = ?
+            """, (plate_name,))
+
+        flash(f"Plate '{plate_name}' archived successfully", 'success')
+
+    except Exception as e:
+        flash(f"Error archiving plate: {str(e)}", 'error')
+
+    return redirect(url_for('plates'))
+
+# =============================================================================
+# API ENDPOINTS - RESTful JSON API for frontend integration
+# =============================================================================
+
+@app.route('/api', methods=['GET'])
+@app.route('/api/', methods=['GET'])
+def api_index():
+    """API documentation and available endpoints."""
+    endpoints = {
+        'message': 'Recipe Management System API',
+        'version': '1.0',
+        'available_endpoints': {
+            'statistics': {
+                'GET /api/stats': 'Get dashboard statistics and inventory value'
+            },
+            'ingredients': {
+                'GET /api/ingredients': 'List all ingredients',
+                'GET /api/ingredients/<name>': 'Get specific ingredient details'
+            },
+            'recipes': {
+                'GET /api/recipes': 'List all recipes with costs',
+                'GET /api/recipes/<name>': 'Get specific recipe with details',
+                'POST /api/recipes/<name>/scale': 'Scale recipe (requires JSON: {"scale_factor": 2.5})'
+            },
+            'plates': {
+                'GET /api/plates': 'List all menu plates',
+                'GET /api/plates/<name>': 'Get specific plate with costs'
+            }
+        },
+        'sample_usage': {
+            'get_stats': 'curl http://localhost:5000/api/stats',
+            'scale_recipe': 'curl -X POST -H "Content-Type: application/json" -d \'{"scale_factor": 3}\' http://localhost:5000/api/recipes/Apple%20Pie/scale'
+        }
+    }
+
+    return jsonify(endpoints)
+
+def _ingredient_to_dict(ing):
+    """JSON form of an ingredient shared by the ingredient API endpoints."""
+    return {
+        'name': ing.name,
+        'category': ing.category,
+        'purchase_unit': ing.purchase_unit,
+        'purchase_price': float(ing.purchase_price),
+        'inventory_unit': ing.inventory_unit,
+        'units_per_purchase': float(ing.units_per_purchase),
+        'cost_per_inventory_unit': float(ing.cost_per_inventory_unit),
+        'recipe_unit': ing.recipe_unit,
+        'recipe_units_per_inventory': float(ing.recipe_units_per_inventory),
+        'cost_per_recipe_unit': float(ing.cost_per_recipe_unit),
+        'yield_percent': float(ing.yield_percent),
+        'on_hand': float(ing.on_hand) if ing.on_hand else 0,
+        'supplier': ing.supplier,
+        'notes': ing.notes
+    }
+
+@app.route('/api/ingredients', methods=['GET'])
+@cached_response()
+def api_get_ingredients():
+    """Get all ingredients as JSON."""
+    try:
+        ingredients = db_manager.get_ingredients()
+        ingredients_data = [_ingredient_to_dict(ing) for ing in ingredients]
+
+        return jsonify({
+            'success': True,
+            'data': ingredients_data,
+            'count': len(ingredients_data)
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/ingredients/<path:ingredient_name>', methods=['GET'])
+def api_get_ingredient(ingredient_name):
+    """Get specific ingredient as JSON."""
+    try:
+        ingredient = db_manager.get_ingredient(ingredient_name)
+
+        if not ingredient:
+            return jsonify({
+                'success': False,
+                'error': 'Ingredient not found'
+            }), 404
+
+        ingredient_data = _ingredient_to_dict(ingredient)
+
+        return jsonify({
+            'success': True,
+            'data': ingredient_data
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/recipes', methods=['GET'])
+@cached_response()
+def api_get_recipes():
+    """Get all recipes as JSON."""
+    try:
+        recipes = db_manager.get_recipes()
+        names = [recipe.name for recipe in recipes]
+        all_ingredients = db_manager.get_recipe_ingredients_bulk(names)
+
+        # Calculate costs if possible; if the batch fails, cost recipes one by
+        # one so only the failing recipe reports 0
+        try:
+            all_costs = db_manager.calculate_recipe_costs(names)
+        except Exception:
+            all_costs = {}
+            for name in names:
+                try:
+                    all_costs[name] = db_manager.calculate_recipe_cost(name)
+                except Exception:
+                    pass
+
+        recipes_data = []
+
+        for recipe in recipes:
+            ingredients_list = []
+
+            for ing in all_ingredients[recipe.name]:
+                ingredients_list.append({
+                    'ingredient_name': ing.ingredient_name,
+                    'quantity': float(ing.quantity),
+                    'unit': ing.unit
+                })
+
+            cost_data = all_costs.get(recipe.name)
+            total_cost = cost_data.get('total_cost', 0) if cost_data else 0
+            cost_per_serving = cost_data.get('cost_per_serving', 0) if cost_data else 0
+
+            recipes_data.append({
+                'name': recipe.name,
+                'servings': recipe.servings,
+                'q_factor': float(recipe.q_factor),
+                'category': 'Main',  # Recipes have no category column yet
+                'description': recipe.description,
+                'instructions': recipe.instructions,
+                'ingredients': ingredients_list,
+                'total_cost': float(total_cost),
+                'cost_per_serving': float(cost_per_serving)
+            })
+
+        return jsonify({
+            'success': True,
+            'data': recipes_data,
+            'count': len(recipes_data)
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/recipes/<path:recipe_name>', methods=['GET'])
+def api_get_recipe(recipe_name):
+    """Get specific recipe as JSON."""
+    try:
+        recipe = db_manager.get_recipe(recipe_name)
+
+        if not recipe:
+            return jsonify({
+                'success': False,
+                'error': 'Recipe not found'
+            }), 404
+
+        # Get recipe ingredients
+        recipe_ingredients = db_manager.get_recipe_ingredients(recipe.name)
+        ingredients_list = []
+
+        for ing in recipe_ingredients:
+            ingredients_list.append({
+                'ingredient_name': ing.ingredient_name,
+                'quantity': float(ing.quantity),
+                'unit': ing.unit
+            })
+
+        # Calculate cost
+        try:
+            cost_data = db_manager.calculate_recipe_cost(recipe.name)
+            total_cost = cost_data.get('total_cost', 0) if cost_data else 0
+            cost_per_serving = cost_data.get('cost_per_serving', 0) if cost_data else 0
+            ingredient_costs = cost_data.get('ingredient_costs', []) if cost_data else []
+        except:
+            total_cost = 0
+            cost_per_serving = 0
+            ingredient_costs = []
+
+        recipe_data = {
+            'name': recipe.name,
+            'servings': recipe.servings,
+            'q_factor': float(recipe.q_factor),
+            'category': 'Main',  # Recipes have no category column yet
+            'description': recipe.description,
+            'instructions': recipe.instructions,
+            'ingredients': ingredients_list,
+            'total_cost': float(total_cost),
+            'cost_per_serving': float(cost_per_serving),
+            'ingredient_costs': ingredient_costs
+        }
+
+        return jsonify({
+            'success': True,
+            'data': recipe_data
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/recipes/<path:recipe_name>/scale', methods=['POST'])
+def api_scale_recipe(recipe_name):
+    """Scale recipe and return JSON."""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or 'scale_factor' not in data:
+            return jsonify({
+                'success': False,
+                'error': 'scale_factor required in JSON body'
+            }), 400
+
+        scale_factor = data['scale_factor']
+        if not _is_amount(scale_factor) or scale_factor == 0:
+            return jsonify({
+                'success': False,
+                'error': 'scale_factor must be a positive number'
+            }), 400
+
+        # Get original recipe
+        recipe = db_manager.get_recipe(recipe_name)
+
+        if not recipe:
+            return jsonify({
+                'success': False,
+                'error': 'Recipe not found'
+            }), 404
+
+        # Get and scale ingredients
+        recipe_ingredients = db_manager.get_recipe_ingredients(recipe.name)
+        scaled_ingredients = []
+
+        for ing in recipe_ingredients:
+            scaled_quantity = float(ing.quantity) * scale_factor
+            scaled_ingredients.append({
+                'ingredient_name': ing.ingredient_name,
+                'original_quantity': float(ing.quantity),
+                'scaled_quantity': scaled_quantity,
+                'unit': ing.unit
+            })
+
+        # Calculate scaled cost
+        ingredient_costs = db_manager.get_ingredient_costs()
+        total_cost = 0
+        for ing in scaled_ingredients:
+            try:
+                if ing['ingredient_name'] in ingredient_costs:
+                    cost_per_recipe_unit, _ = ingredient_costs[ing['ingredient_name']]
+                    # Calculate cost using cost_per_recipe_unit (already includes yield)
+                    ingredient_cost = float(cost_per_recipe_unit) * ing['scaled_quantity']
+                    total_cost += ingredient_cost
+                    ing['cost'] = ingredient_cost
+            except:
+                ing['cost'] = 0
+
+        # Apply Q-factor
+        q_factor_cost = total_cost * float(recipe.q_factor)
+        final_cost = total_cost + q_factor_cost
+        scaled_servings = recipe.servings * scale_factor
+        cost_per_serving = final_cost / scaled_servings if scaled_servings > 0 else 0
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'recipe_name': recipe_name,
+                'scale_factor': scale_factor,
+                'original_servings': recipe.servings,
+                'scaled_servings': scaled_servings,
+                'ingredients': scaled_ingredients,
+                'total_ingredient_cost': total_cost,
+                'q_factor_cost': q_factor_cost,
+                'total_cost': final_cost,
+                'cost_per_serving': cost_per_serving
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/plates', methods=['GET'])
+@cached_response()
+def api_get_plates():
+    """Get all plates as JSON."""
+    try:
+        plates = db_manager.get_plates()
+        plate_totals = db_manager.price_all_plates()
+        all_ingredients = db_manager.get_plate_ingredients_bulk([plate.name for plate in plates])
+        plates_data = []
+
+        for plate in plates:
+            ingredients_list = []
+
+            for ing in all_ingredients[plate.name]:
+                ingredients_list.append({
+                    'ingredient_name': ing.ingredient_name,
+                    'quantity': float(ing.quantity),
+                    'unit': ing.unit
+                })
+
+            total_cost = plate_totals.get(plate.name, 0)
+
+            plates_data.append({
+                'name': plate.name,
+                'description': plate.description,
+                'category': plate.category,
+                'ingredients': ingredients_list,
+                'total_cost': float(total_cost)
+            })
+
+        return jsonify({
+            'success': True,
+            'data': plates_data,
+            'count': len(plates_data)
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/plates/<path:plate_name>', methods=['GET'])
+def api_get_plate(plate_name):
+    """Get specific plate as JSON."""
+    try:
+        plate = db_manager.get_plate(plate_name)
+
+        if not plate:
+            return jsonify({
+                'success': False,
+                'error': 'Plate not found'
+            }), 404
+
+        # Get plate ingredients
+        plate_ingredients = db_manager.get_plate_ingredients(plate.name)
+        ingredients_list = []
+
+        for ing in plate_ingredients:
+            ingredients_list.append({
+                'ingredient_name': ing.ingredient_name,
+                'quantity': float(ing.quantity),
+                'unit': ing.unit
+            })
+
+        # Calculate cost
+        try:
+            cost_data = db_manager.calculate_plate_cost(plate.name)
+            total_cost = cost_data.get('total_cost', 0) if cost_data else 0
+            ingredient_costs = cost_data.get('ingredient_costs', []) if cost_data else []
+        except:
+            total_cost = 0
+            ingredient_costs = []
+
+        plate_data = {
+            'name': plate.name,
+            'description': plate.description,
+            'category': plate.category,
+            'ingredients': ingredients_list,
+            'total_cost': float(total_cost),
+            'ingredient_costs': ingredient_costs
+        }
+
+        return jsonify({
+            'success': True,
+            'data': plate_data
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/stats', methods=['GET'])
+@cached_response()
+def api_get_stats():
+    """Get dashboard statistics as JSON."""
+    try:
+        stats = db_manager.get_dashboard_stats()
+        stats['total_recipe_value'] = 0  # Could calculate total value of all recipes
+
+        return jsonify({
+            'success': True,
+            'data': stats
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/prep-list')
+def prep_list():
+    """Prep list page showing what needs to be prepped by station."""
+
+    with db_manager.connect() as conn:
+        cursor = conn.cursor()
+
+        # Get all recipes with prep tracking
+        cursor.execute("""
+            SELECT name, station, prepared_servings, par_servings,
+                   MAX(0, par_servings - prepared_servings) as need,
+                   CASE WHEN prepared_servings >= par_servings THEN 'ok'
+                        WHEN prepared_servings >= par_servings * 0.5 THEN 'low'
+                        ELSE 'critical' END as status
+            FROM recipes
+            WHERE station != 'Beverage'
+            ORDER BY station, name
+        """)
+
+        recipes_data = cursor.fetchall()
+
+    # Group by station
+    stations = {}
+    for name, station, prepared, par, need, status in recipes_data:
+        if station not in stations:
+            stations[station] = {
+                'station': station,
+                'items': [],
+                'total_below_par': 0
+            }
+
+        stations[station]['items'].append({
+            'name': name,
+            'prepared': prepared,
+            'par': par,
+            'need': need,
+            'status': status
+        })
+
+        if need > 0:
+            stations[station]['total_below_par'] += 1
+
+    # Convert to list and sort
+    stations_list = sorted(stations.values(), key=lambda x: x['station'])
+
+    return render_template('prep_list.html', stations=stations_list)
+
+@app.route('/api/recipe/<path:recipe_name>/update_prepared', methods=['POST'])
+def update_prepared_servings(recipe_name):
+    """API endpoint to update prepared_servings for a recipe."""
+
+    data = request.get_json(silent=True)
+    new_value = data.get('prepared_servings') if isinstance(data, dict) else None
+
+    if not _is_amount(new_value):
+        return jsonify({'error': 'Invalid prepared_servings value'}), 400
+
+    try:
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE recipes SET prepared_servings = ? WHERE name = ?",
+                (new_value, recipe_name)
+            )
+
+            # Return updated values
+            cursor.execute(
+                "SELECT prepared_servings, par_servings FROM recipes WHERE name = ?",
+                (recipe_name,)
+            )
+            row = cursor.fetchone()
+            if row:
+                prepared, par = row
+                return jsonify({
+                    'success': True,
+                    'prepared_servings': prepared,
+                    'par_servings': par,
+                    'need': max(0, par - prepared)
+                })
+            else:
+                return jsonify({'error': 'Recipe not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/bulk-inventory')
+def bulk_inventory():
+    """Bulk inventory status showing items below par."""
+
+    with db_manager.connect() as conn:
+        cursor = conn.cursor()
+
+        # Get all ingredients with inventory tracking and check if used in recipes OR plates
+        cursor.execute("""
+            SELECT i.id, i.name, i.category, i.on_hand, i.par_level, i.inventory_unit,
+                   MAX(0, i.par_level - i.on_hand) as need,
+                   CASE WHEN i.on_hand >= i.par_level THEN 'ok'
+                        WHEN i.on_hand >= i.par_level * 0.5 THEN 'low'
+                        ELSE 'critical' END as status,
+                   (EXISTS (SELECT 1 FROM recipe_ingredients ri WHERE ri.ingredient_name = i.name)
+                    OR EXISTS (SELECT 1 FROM plate_ingredients pi WHERE pi.ingredient_name = i.name)) as is_used
+            FROM ingredients i
+            ORDER BY i.category, i.name
+        """)
+
+        ingredients_data = cursor.fetchall()
+
+    # Group by category
+    categories = {}
+    below_par_count = 0
+
+    for id, name, category, on_hand, par, inventory_unit, need, status, is_used in ingredients_data:
+        if category not in categories:
+            categories[category] = {
+                'category': category,
+                'items': [],
+                'below_par': 0
+            }
+
+        categories[category]['items'].append({
+            'id': id,
+            'name': name,
+            'on_hand': on_hand,
+            'par': par,
+            'inventory_unit': inventory_unit,
+            'need': need,
+            'status': status,
+            'is_used': is_used
+        })
+
+        if need > 0:
+            categories[category]['below_par'] += 1
+            below_par_count += 1
+
+    # Convert to list and sort
+    categories_list = sorted(categories.values(), key=lambda x: x['category'])
+
+    return render_template('bulk_inventory.html', categories=categories_list, below_par_count=below_par_count)
+
+def _bulk_items(data):
+    """Return the item list of a {"items": [...]} request body, or None."""
+    return data.get('items') if isinstance(data, dict) else None
+
+@app.route('/api/recipes/update_prepared_bulk', methods=['POST'])
+def update_prepared_servings_bulk():
+    """API endpoint to update prepared_servings for many recipes in one transaction."""
+    try:
+        updates = _bulk_updates(_bulk_items(request.get_json(silent=True)), 'name', str, 'prepared_servings')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        updated = db_manager.update_recipe_prepared_bulk(updates)
+        return jsonify({'success': True, 'updated': updated})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/ingredients/update_onhand_bulk', methods=['POST'])
+def update_ingredient_onhand_bulk():
+    """API endpoint to update on_hand for many ingredients in one transaction."""
+    try:
+        updates = _bulk_updates(_bulk_items(request.get_json(silent=True)), 'name', str, 'on_hand')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        updated = db_manager.update_ingredient_stock_bulk_by_name(updates)
+        return jsonify({'success': True, 'updated': updated})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/ingredient/<path:ingredient_name>/update_onhand', methods=['POST'])
+def update_ingredient_onhand(ingredient_name):
+    """API endpoint to update on_hand for an ingredient."""
+
+    data = request.get_json(silent=True)
+    new_value = data.get('on_hand') if isinstance(data, dict) else None
+
+    if not _is_amount(new_value):
+        return jsonify({'error': 'Invalid on_hand value'}), 400
+
+    try:
+        with db_manager.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE ingredients SET on_hand = ? WHERE name = ?",
+                (new_value, ingredient_name)
+            )
+
+            # Return updated values
+            cursor.execute(
+                "SELECT on_hand, par_level, recipe_unit FROM ingredients WHERE name = ?",
+                (ingredient_name,)
+            )
+            row = cursor.fetchone()
+            if row:
+                on_hand, par, recipe_unit = row
+                return jsonify({
+                    'success': True,
+                    'on_hand': on_hand,
+                    'par_level': par,
+                    'need': max(0, par - on_hand),
+                    'recipe_unit': recipe_unit
+                })
+            else:
+                return jsonify({'error': 'Ingredient not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+if __name__ == '__main__':
+    if not DB_PATH.exists():
+        print("❌ Database not found. Please run the migration script first:")
+        print("   python3 fix_and_import_data.py")
+        exit(1)
+
+    print("🍳 Starting Recipe Management System Web Interface...")
+    print("📂 Database:", DB_PATH)
+    print("🌐 Open your browser to: http://localhost:5000")
+    print("🛑 Press Ctrl+C to stop the server")
+
+    # Development server: log every SQL statement when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        db_manager.set_trace_callback(logging.getLogger('rms.sql').debug)
+
+    # Werkzeug's server is for development only; set FLASK_DEBUG=1 for the
+    # reloader and debugger. In production serve the app with a WSGI server,
+    # e.g. gunicorn -k gthread --threads 8 web_app:app
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000)
\ No newline at end of file